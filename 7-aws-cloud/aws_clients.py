@@ -0,0 +1,138 @@
+"""
+Registro compartilhado de clientes boto3 para todos os gerenciadores.
+
+Clientes são criados uma única vez por (serviço, região, configuração) e
+reutilizados, mantendo o pool de conexões HTTP aberto entre chamadas.
+Clientes boto3 são thread-safe; resources não são, por isso ficam em um
+cache separado por thread.
+
+O boto3 só é importado na criação do primeiro cliente, e os gerenciadores
+usam LazyClient para adiar essa criação até o primeiro uso.
+"""
+
+import threading
+
+# Configuração padrão: pool maior para uso com threads, retries adaptativos
+# (com limitação de taxa no cliente) e keep-alive TCP
+DEFAULT_CONFIG_OPTIONS = {
+    'max_pool_connections': 50,
+    'retries': {'max_attempts': 10, 'mode': 'adaptive'},
+    'tcp_keepalive': True
+}
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+_local = threading.local()
+
+
+def _config_key(overrides):
+    return tuple(sorted((name, repr(value)) for name, value in overrides.items()))
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        import boto3.session
+        _session = boto3.session.Session()
+    return _session
+
+
+def _build_config(overrides):
+    from botocore.config import Config
+    return Config(**{**DEFAULT_CONFIG_OPTIONS, **overrides})
+
+
+def get_client(service, region='us-east-1', **config_overrides):
+    """
+    Obtém um cliente compartilhado.
+
+    Args:
+        service (str): Nome do serviço (ex: 's3', 'ec2')
+        region (str): Região AWS
+        **config_overrides: Opções de botocore.config.Config que substituem
+            a configuração padrão (ex: max_pool_connections=100)
+
+    Returns:
+        Cliente boto3 reutilizado entre os gerenciadores
+    """
+    key = (service, region, _config_key(config_overrides))
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                # Session.client não é thread-safe: a criação fica sob o lock
+                client = _get_session().client(
+                    service, region_name=region, config=_build_config(config_overrides)
+                )
+                _clients[key] = client
+    return client
+
+
+def get_resource(service, region='us-east-1', **config_overrides):
+    """
+    Obtém um resource reutilizado dentro da thread atual.
+
+    Args:
+        service (str): Nome do serviço (ex: 's3', 'dynamodb')
+        region (str): Região AWS
+        **config_overrides: Opções de botocore.config.Config
+
+    Returns:
+        Resource boto3 da thread atual
+    """
+    resources = getattr(_local, 'resources', None)
+    if resources is None:
+        resources = _local.resources = {}
+
+    key = (service, region, _config_key(config_overrides))
+    resource = resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _get_session().resource(
+                service, region_name=region, config=_build_config(config_overrides)
+            )
+        resources[key] = resource
+    return resource
+
+
+def clear():
+    """Descarta os clientes em cache (ex: após trocar credenciais)."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _session = None
+    _local.__dict__.clear()
+
+
+class LazyClient:
+    """
+    Atributo de classe que cria o cliente (ou resource) no primeiro acesso.
+
+    A instância precisa ter o atributo 'region'. Um cliente é guardado no
+    __dict__ da instância, então os acessos seguintes não passam mais por
+    aqui. Um resource não é thread-safe: cada acesso passa por
+    get_resource, que devolve o resource da thread atual.
+
+    Exemplo:
+        class S3BucketManager:
+            s3_client = LazyClient('s3')
+    """
+
+    def __init__(self, service, resource=False):
+        self.service = service
+        self.resource = resource
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.resource:
+            return get_resource(self.service, instance.region)
+        value = get_client(self.service, instance.region)
+        instance.__dict__[self.name] = value
+        return value
@@ -0,0 +1,149 @@
+"""
+Limitador de taxa por tabela para cargas no DynamoDB.
+
+Token bucket em unidades de capacidade (RCU/WCU) com ajuste AIMD: a taxa
+cresce aos poucos (aditivo) enquanto não há throttling e cai pela metade
+(multiplicativo) quando o DynamoDB recusa requisições. O consumo real,
+lido de ConsumedCapacity, corrige as estimativas feitas antes de cada
+chamada.
+"""
+
+import time
+import threading
+
+# Taxa inicial para tabelas on-demand (sem capacidade provisionada)
+ON_DEMAND_START_RATE = 1000
+
+
+class CapacityLimiter:
+    def __init__(self, rate, min_rate=1, max_rate=None, adaptive=True,
+                 increase_fraction=0.05, decrease_factor=0.5, adjust_interval=1.0):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate (float): Unidades de capacidade por segundo iniciais
+            min_rate (float): Taxa mínima após reduções
+            max_rate (float): Taxa máxima (None = sem limite)
+            adaptive (bool): Se False, a taxa é fixa (sem AIMD)
+            increase_fraction (float): Aumento aditivo por intervalo, como
+                fração da taxa inicial
+            decrease_factor (float): Fator multiplicativo aplicado no throttling
+            adjust_interval (float): Segundos mínimos entre dois aumentos, entre
+                duas reduções e entre uma redução e o aumento seguinte
+        """
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.adaptive = adaptive
+        self.increase_step = max(1.0, rate * increase_fraction)
+        self.decrease_factor = decrease_factor
+        self.adjust_interval = adjust_interval
+        self.throttles = 0
+        self._tokens = self.rate
+        self._updated = time.monotonic()
+        # Aumento e redução têm relógios separados: um aumento recente
+        # nunca impede a redução
+        self._last_increase = self._updated
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_table_description(cls, description, kind, **kwargs):
+        """
+        Cria um limitador dimensionado pela capacidade da tabela.
+
+        Args:
+            description (dict): Resposta de describe_table['Table']
+            kind (str): 'read' ou 'write'
+            **kwargs: Argumentos extras do construtor
+
+        Returns:
+            CapacityLimiter: Limitador da tabela
+        """
+        field = 'ReadCapacityUnits' if kind == 'read' else 'WriteCapacityUnits'
+        billing = description.get('BillingModeSummary', {}).get('BillingMode')
+        units = description.get('ProvisionedThroughput', {}).get(field, 0)
+        if billing == 'PAY_PER_REQUEST' or not units:
+            return cls(ON_DEMAND_START_RATE, **kwargs)
+        return cls(units, max_rate=units, **kwargs)
+
+    def _refill(self, now):
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, units):
+        """
+        Reserva unidades de capacidade, esperando se necessário.
+
+        O saldo pode ficar negativo; quem chamou espera o tempo para
+        quitá-lo, mantendo a taxa média no limite.
+
+        Args:
+            units (float): Unidades estimadas para a próxima requisição
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+    def settle(self, estimated, consumed):
+        """
+        Corrige o saldo com o consumo real informado pelo DynamoDB.
+
+        Args:
+            estimated (float): Unidades reservadas em acquire()
+            consumed (float): Unidades de ConsumedCapacity (None = sem informação)
+        """
+        if consumed is None:
+            return
+        with self._lock:
+            self._tokens += estimated - consumed
+
+    def on_success(self):
+        """
+        Aumento aditivo da taxa.
+
+        No máximo uma vez por intervalo, e só depois de um intervalo inteiro
+        sem redução.
+        """
+        if not self.adaptive:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if (now - self._last_increase < self.adjust_interval
+                    or now - self._last_decrease < self.adjust_interval):
+                return
+            self._last_increase = now
+            self.rate += self.increase_step
+            if self.max_rate is not None:
+                self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self):
+        """
+        Redução multiplicativa da taxa.
+
+        No máximo uma vez por intervalo (uma rajada de throttlings conta como
+        um só sinal), independentemente de aumentos recentes.
+        """
+        with self._lock:
+            self.throttles += 1
+            if not self.adaptive:
+                return
+            now = time.monotonic()
+            if now - self._last_decrease < self.adjust_interval:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0)
+
+    def stats(self):
+        """
+        Retorna o estado do limitador.
+
+        Returns:
+            dict: Taxa atual e número de throttlings observados
+        """
+        return {'rate': round(self.rate, 2), 'throttles': self.throttles}
@@ -0,0 +1,518 @@
+"""
+Exportação e importação de tabelas DynamoDB em arquivos comprimidos.
+
+A exportação faz um scan paralelo (Segment/TotalSegments) e grava cada
+segmento em partes numeradas, em NDJSON (gzip ou zstd) ou Parquet. A
+importação relê essas partes e grava os itens com BatchWriteItem.
+
+O manifesto _export.json (e _import-<tabela>.json, na importação) registra
+o que já foi concluído: um job interrompido retoma de onde parou ao ser
+executado de novo com os mesmos argumentos.
+
+Uso:
+    python dynamodb_export.py export usuarios ./export --format parquet
+    python dynamodb_export.py import usuarios_copia ./export
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import shutil
+import argparse
+import threading
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 's3'))
+from ndjson_codec import NDJSONReader, iter_records
+from dynamodb_manager import DynamoDBManager
+
+MANIFEST = '_export.json'
+READ_CHUNK_SIZE = 1024 * 1024
+PARQUET_BATCH_SIZE = 1000
+
+# Compressão padrão de cada formato
+DEFAULT_COMPRESSION = {'ndjson': 'gzip', 'parquet': 'zstd'}
+NDJSON_EXTENSIONS = {None: '.ndjson', 'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}
+
+# Metadado Parquet com as colunas gravadas como DynamoDB JSON
+JSON_COLUMNS_METADATA = b'dynamodb_json_columns'
+
+_ABSENT = object()
+
+
+def _pyarrow():
+    """
+    Importa o pyarrow sob demanda.
+
+    O import custa mais que o resto do módulo, então só os caminhos
+    Parquet o pagam.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Formato parquet requer o pacote 'pyarrow'") from None
+    return pyarrow
+
+
+def _encode_value(value):
+    """Troca bytes por base64 em um valor já em DynamoDB JSON."""
+    (kind, inner), = value.items()
+    if kind == 'B':
+        return {'B': base64.b64encode(inner).decode('ascii')}
+    if kind == 'BS':
+        return {'BS': [base64.b64encode(b).decode('ascii') for b in inner]}
+    if kind == 'M':
+        return {'M': {k: _encode_value(v) for k, v in inner.items()}}
+    if kind == 'L':
+        return {'L': [_encode_value(v) for v in inner]}
+    return value
+
+
+def _decode_value(value):
+    """Inverso de _encode_value."""
+    (kind, inner), = value.items()
+    if kind == 'B':
+        return {'B': base64.b64decode(inner)}
+    if kind == 'BS':
+        return {'BS': [base64.b64decode(b) for b in inner]}
+    if kind == 'M':
+        return {'M': {k: _decode_value(v) for k, v in inner.items()}}
+    if kind == 'L':
+        return {'L': [_decode_value(v) for v in inner]}
+    return value
+
+
+def encode_item(item):
+    """
+    Converte um item do boto3 (Decimal, set, Binary) em DynamoDB JSON.
+
+    Binários viram base64, como nas exportações nativas do DynamoDB, então
+    o resultado pode ser gravado com json.dumps sem perda de tipos.
+
+    Args:
+        item (dict): Item como retornado pelo resource do boto3
+
+    Returns:
+        dict: Item em DynamoDB JSON ({'atributo': {'S': ...}})
+    """
+    from boto3.dynamodb.types import TypeSerializer
+    serializer = TypeSerializer()
+    return {name: _encode_value(serializer.serialize(value)) for name, value in item.items()}
+
+
+def decode_item(record):
+    """
+    Converte um item em DynamoDB JSON (ver encode_item) para tipos Python.
+
+    Args:
+        record (dict): Item em DynamoDB JSON
+
+    Returns:
+        dict: Item aceito por put_item/batch_write_items
+    """
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    return {name: deserializer.deserialize(_decode_value(value)) for name, value in record.items()}
+
+
+def _arrow_column(values):
+    """
+    Converte os valores de um atributo em uma coluna Arrow nativa.
+
+    Só atributos escalares de um único tipo (string, número, booleano ou
+    binário) viram colunas nativas; retorna None para os demais.
+    """
+    from boto3.dynamodb.types import Binary
+    pyarrow = _pyarrow()
+
+    present = [v for v in values if v is not _ABSENT]
+    kinds = {type(v) for v in present}
+    if kinds == {str}:
+        arrow_type = pyarrow.string()
+    elif kinds == {bool}:
+        arrow_type = pyarrow.bool_()
+    elif kinds == {Decimal}:
+        arrow_type = None
+    elif kinds and kinds <= {bytes, Binary}:
+        arrow_type = pyarrow.binary()
+        values = [v.value if isinstance(v, Binary) else v for v in values]
+    else:
+        return None
+
+    try:
+        return pyarrow.array([None if v is _ABSENT else v for v in values], type=arrow_type)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+        # Ex: números com mais de 38 dígitos de precisão
+        return None
+
+
+def _parquet_table(items):
+    """
+    Monta uma tabela Arrow com uma coluna por atributo.
+
+    Atributos que não cabem em uma coluna nativa (mapas, listas, sets,
+    NULL ou tipos misturados) são gravados como DynamoDB JSON em uma coluna
+    de texto e listados no metadado do arquivo, então a importação é exata.
+    """
+    pyarrow = _pyarrow()
+    names = list(dict.fromkeys(name for item in items for name in item))
+    columns = {}
+    json_columns = []
+    for name in names:
+        values = [item.get(name, _ABSENT) for item in items]
+        column = _arrow_column(values)
+        if column is None:
+            encoded = [None if v is _ABSENT else json.dumps(encode_item({name: v})[name])
+                       for v in values]
+            column = pyarrow.array(encoded, type=pyarrow.string())
+            json_columns.append(name)
+        columns[name] = column
+
+    table = pyarrow.table(columns)
+    return table.replace_schema_metadata({JSON_COLUMNS_METADATA: json.dumps(json_columns).encode()})
+
+
+def _iter_parquet_items(path):
+    """Lê um arquivo Parquet exportado, em lotes, gerando itens do boto3."""
+    parquet_file = _pyarrow().parquet.ParquetFile(path)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    json_columns = set(json.loads(metadata.get(JSON_COLUMNS_METADATA, b'[]')))
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+        for row in batch.to_pylist():
+            item = {}
+            for name, value in row.items():
+                if value is None:
+                    continue
+                if name in json_columns:
+                    value = decode_item({name: json.loads(value)})[name]
+                item[name] = value
+            yield item
+
+
+def _write_json(path, data):
+    """Grava um JSON de forma atômica (arquivo temporário + rename)."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+class DynamoDBExporter:
+    def __init__(self, region='us-east-1', manager=None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            region (str): Região AWS
+            manager (DynamoDBManager): Gerenciador a reutilizar (opcional)
+        """
+        self.region = region
+        self.manager = manager or DynamoDBManager(region=region)
+
+    def _log(self, message, **fields):
+        self.manager._log(message, **fields)
+
+    def _write_part(self, path, items, file_format, compression):
+        """Grava uma parte de forma atômica e retorna o número de itens."""
+        temp_path = path + '.tmp'
+        if file_format == 'parquet':
+            items = list(items)
+            if items:
+                _pyarrow().parquet.write_table(_parquet_table(items), temp_path,
+                                            compression=compression or 'none')
+            count = len(items)
+        else:
+            reader = NDJSONReader(({'Item': encode_item(item)} for item in items), compression)
+            with open(temp_path, 'wb') as f:
+                shutil.copyfileobj(reader, f, READ_CHUNK_SIZE)
+                f.flush()
+                os.fsync(f.fileno())
+            count = reader.records_written
+
+        if count:
+            os.replace(temp_path, path)
+        elif os.path.exists(temp_path):
+            os.remove(temp_path)
+        return count
+
+    def _export_segment(self, table_name, output_dir, segment, manifest, save,
+                        rows_per_file, page_size):
+        """Exporta um segmento do scan em partes, atualizando o manifesto."""
+        state = manifest['segments'][str(segment)]
+        if state['done']:
+            return
+        segment_dir = os.path.join(output_dir, f'segment-{segment:04d}')
+        os.makedirs(segment_dir, exist_ok=True)
+        if manifest['format'] == 'parquet':
+            extension = '.parquet'
+        else:
+            extension = NDJSON_EXTENSIONS[manifest['compression']]
+
+        start_key = state['last_key'] and decode_item(state['last_key'])
+        pages = self.manager.iter_scan_pages(
+            table_name, segment=segment, total_segments=manifest['total_segments'],
+            page_size=page_size, exclusive_start_key=start_key
+        )
+        while not state['done']:
+            # Uma parte termina no fim de uma página, para que a chave
+            # salva no manifesto retome exatamente depois dela
+            cursor = {'items': 0, 'last_key': None, 'finished': True}
+
+            def part_items():
+                for items, last_key in pages:
+                    yield from items
+                    cursor['items'] += len(items)
+                    cursor['last_key'] = last_key
+                    if last_key and cursor['items'] >= rows_per_file:
+                        cursor['finished'] = False
+                        return
+
+            name = f"part-{len(state['files']):05d}{extension}"
+            count = self._write_part(os.path.join(segment_dir, name), part_items(),
+                                     manifest['format'], manifest['compression'])
+            save(segment, name if count else None, count,
+                 cursor['last_key'], cursor['finished'])
+
+    def export_table(self, table_name, output_dir, file_format='ndjson', compression=None,
+                     total_segments=8, max_workers=None, rows_per_file=100000,
+                     page_size=None, resume=True):
+        """
+        Exporta uma tabela com scan paralelo para arquivos particionados.
+
+        Cada segmento grava suas próprias partes (segment-NNNN/part-NNNNN),
+        com no máximo uma parte em memória por thread no Parquet e apenas
+        uma página por thread no NDJSON. Após cada parte o manifesto guarda
+        a chave para continuar o segmento.
+
+        NDJSON usa o formato das exportações nativas do DynamoDB (uma linha
+        {"Item": {...}} em DynamoDB JSON). Parquet grava uma coluna por
+        atributo; atributos não escalares ficam como DynamoDB JSON.
+
+        Args:
+            table_name (str): Nome da tabela
+            output_dir (str): Diretório de destino
+            file_format (str): 'ndjson' ou 'parquet'
+            compression (str): gzip/zstd (NDJSON) ou codec Parquet
+                (padrão: gzip para NDJSON, zstd para Parquet)
+            total_segments (int): Segmentos do scan paralelo
+            max_workers (int): Threads simultâneas (padrão: total_segments)
+            rows_per_file (int): Itens por parte (aproximado, fecha no fim da página)
+            page_size (int): Itens avaliados por requisição de scan (Limit)
+            resume (bool): Retoma a partir do manifesto, se existir
+
+        Returns:
+            dict: Resumo com 'items', 'files', 'complete', 'seconds' e
+                'items_per_second', ou None se o manifesto não confere
+        """
+        if file_format not in DEFAULT_COMPRESSION:
+            raise ValueError(f"Formato não suportado: {file_format}")
+        if file_format == 'parquet':
+            _pyarrow()
+        if compression is None:
+            compression = DEFAULT_COMPRESSION[file_format]
+        if file_format == 'ndjson' and compression not in NDJSON_EXTENSIONS:
+            raise ValueError(f"Compressão não suportada para NDJSON: {compression}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_path = os.path.join(output_dir, MANIFEST)
+        manifest = _read_json(manifest_path) if resume else None
+        settings = {'table': table_name, 'format': file_format,
+                    'compression': compression, 'total_segments': total_segments}
+        if manifest is None:
+            manifest = dict(settings, complete=False, segments={
+                str(segment): {'files': [], 'items': 0, 'last_key': None, 'done': False}
+                for segment in range(total_segments)
+            })
+            _write_json(manifest_path, manifest)
+        elif any(manifest[k] != v for k, v in settings.items()):
+            self._log(f"✗ Manifesto em {output_dir} é de outra exportação "
+                      f"({', '.join(f'{k}={manifest[k]}' for k in settings)})")
+            return None
+        else:
+            pending = sum(not s['done'] for s in manifest['segments'].values())
+            self._log(f"  Retomando exportação de {table_name}: {pending} segmento(s) pendente(s)")
+
+        lock = threading.Lock()
+        start = time.monotonic()
+        exported = 0
+
+        def save(segment, file_name, count, last_key, finished):
+            nonlocal exported
+            with lock:
+                state = manifest['segments'][str(segment)]
+                if file_name:
+                    state['files'].append(file_name)
+                state['items'] += count
+                state['last_key'] = last_key and encode_item(last_key)
+                state['done'] = finished
+                exported += count
+                _write_json(manifest_path, manifest)
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers or total_segments) as executor:
+            futures = {
+                executor.submit(self._export_segment, table_name, output_dir, segment,
+                                manifest, save, rows_per_file, page_size): segment
+                for segment in range(total_segments)
+            }
+            for future, segment in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    self._log(f"✗ Erro ao exportar segmento {segment}: {e}")
+
+        with lock:
+            manifest['complete'] = not failed
+            _write_json(manifest_path, manifest)
+
+        elapsed = time.monotonic() - start
+        segments = manifest['segments'].values()
+        summary = {
+            'items': sum(s['items'] for s in segments),
+            'files': sum(len(s['files']) for s in segments),
+            'complete': manifest['complete'],
+            'seconds': round(elapsed, 2),
+            'items_per_second': round(exported / elapsed, 1) if elapsed else 0
+        }
+        if failed:
+            self._log(f"✗ Exportação de {table_name} incompleta: {failed} segmento(s) "
+                      f"com erro; execute de novo para retomar")
+        else:
+            self._log(f"✓ {summary['items']} item(ns) de {table_name} exportado(s) em "
+                      f"{summary['files']} arquivo(s) ({summary['items_per_second']} itens/s)")
+        return summary
+
+    def _list_parts(self, input_dir):
+        """Lista as partes a importar, em ordem, com formato e compressão."""
+        manifest = _read_json(os.path.join(input_dir, MANIFEST))
+        if manifest is not None:
+            return [
+                (os.path.join(f'segment-{int(segment):04d}', name),
+                 manifest['format'], manifest['compression'])
+                for segment, state in sorted(manifest['segments'].items(), key=lambda s: int(s[0]))
+                for name in state['files']
+            ]
+
+        # Sem manifesto: todas as partes reconhecidas pela extensão
+        parts = []
+        for directory, _, files in sorted(os.walk(input_dir)):
+            for name in sorted(files):
+                path = os.path.relpath(os.path.join(directory, name), input_dir)
+                if name.endswith('.parquet'):
+                    parts.append((path, 'parquet', None))
+                    continue
+                for compression, extension in NDJSON_EXTENSIONS.items():
+                    if name.endswith(extension):
+                        parts.append((path, 'ndjson', compression))
+        return parts
+
+    def _iter_part(self, path, file_format, compression):
+        """Gera os itens (tipos do boto3) de uma parte exportada."""
+        if file_format == 'parquet':
+            yield from _iter_parquet_items(path)
+            return
+        with open(path, 'rb') as f:
+            chunks = iter(lambda: f.read(READ_CHUNK_SIZE), b'')
+            for record in iter_records(chunks, compression):
+                yield decode_item(record['Item'])
+
+    def import_table(self, table_name, input_dir, max_workers=4, wcu_per_second=None,
+                     resume=True):
+        """
+        Importa para uma tabela as partes geradas por export_table.
+
+        As partes são lidas sob demanda e gravadas com batch_write_items.
+        Cada parte gravada sem falhas é registrada em _import-<tabela>.json
+        no diretório de entrada, e é pulada quando o job é retomado.
+
+        Args:
+            table_name (str): Tabela de destino (já criada)
+            input_dir (str): Diretório da exportação
+            max_workers (int): Threads de escrita
+            wcu_per_second (float): Orçamento de WCU por segundo (opcional)
+            resume (bool): Pula as partes já importadas
+
+        Returns:
+            dict: Resumo com 'files', 'skipped', 'written', 'failed',
+                'seconds' e 'items_per_second'
+        """
+        checkpoint_path = os.path.join(input_dir, f'_import-{table_name}.json')
+        checkpoint = (_read_json(checkpoint_path) if resume else None) or {'files': []}
+        done = set(checkpoint['files'])
+        parts = self._list_parts(input_dir)
+        summary = {'files': len(parts), 'skipped': 0, 'written': 0, 'failed': 0}
+        start = time.monotonic()
+
+        for path, file_format, compression in parts:
+            if path in done:
+                summary['skipped'] += 1
+                continue
+            result = self.manager.batch_write_items(
+                table_name,
+                self._iter_part(os.path.join(input_dir, path), file_format, compression),
+                max_workers=max_workers, wcu_per_second=wcu_per_second
+            )
+            summary['written'] += result['written']
+            summary['failed'] += result['failed']
+            if not result['failed']:
+                checkpoint['files'].append(path)
+                _write_json(checkpoint_path, checkpoint)
+
+        elapsed = time.monotonic() - start
+        summary['seconds'] = round(elapsed, 2)
+        summary['items_per_second'] = round(summary['written'] / elapsed, 1) if elapsed else 0
+        self._log(f"✓ {summary['written']} item(ns) importado(s) em {table_name} de "
+                  f"{summary['files'] - summary['skipped']} arquivo(s) "
+                  f"({summary['failed']} falha(s), {summary['skipped']} já importado(s))")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta e importa tabelas DynamoDB')
+    parser.add_argument('--region', default='us-east-1', help='Região AWS')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help='Exporta uma tabela')
+    export_parser.add_argument('table', help='Tabela de origem')
+    export_parser.add_argument('output_dir', help='Diretório de destino')
+    export_parser.add_argument('--format', default='ndjson', choices=sorted(DEFAULT_COMPRESSION))
+    export_parser.add_argument('--compression', help='Compressão (padrão depende do formato)')
+    export_parser.add_argument('--segments', type=int, default=8, help='Segmentos do scan')
+    export_parser.add_argument('--rows-per-file', type=int, default=100000, help='Itens por parte')
+    export_parser.add_argument('--restart', action='store_true', help='Ignora o manifesto existente')
+
+    import_parser = commands.add_parser('import', help='Importa uma exportação')
+    import_parser.add_argument('table', help='Tabela de destino')
+    import_parser.add_argument('input_dir', help='Diretório da exportação')
+    import_parser.add_argument('--workers', type=int, default=4, help='Threads de escrita')
+    import_parser.add_argument('--wcu', type=float, help='Orçamento de WCU por segundo')
+    import_parser.add_argument('--restart', action='store_true', help='Ignora o checkpoint existente')
+    args = parser.parse_args()
+
+    exporter = DynamoDBExporter(region=args.region)
+    if args.command == 'export':
+        exporter.export_table(args.table, args.output_dir, file_format=args.format,
+                              compression=args.compression, total_segments=args.segments,
+                              rows_per_file=args.rows_per_file, resume=not args.restart)
+    else:
+        exporter.import_table(args.table, args.input_dir, max_workers=args.workers,
+                              wcu_per_second=args.wcu, resume=not args.restart)
+
+
+if __name__ == '__main__':
+    main()
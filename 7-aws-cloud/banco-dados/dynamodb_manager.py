@@ -2,19 +2,272 @@
 Script para operações com DynamoDB.
 """
 
-import boto3
-from botocore.exceptions import ClientError
+import os
+import sys
+import time
+import math
+import random
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import (BotoCoreError, ClientError, HTTPClientError,
+                                 ConnectionError as BotoConnectionError)
 import json
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient, get_resource
+from parallel import iter_parallel
+from item_cache import MISSING
+from capacity_limiter import CapacityLimiter
+
+
+def print_log(message, **fields):
+    """Logger padrão: imprime a mensagem no stdout."""
+    print(message)
+
+
+def logging_sink(logger):
+    """
+    Cria um logger estruturado a partir de um logging.Logger.
+    
+    Os campos extras (event, table...) vão em record.fields; mensagens de
+    erro (iniciadas por '✗') são registradas com nível ERROR.
+    
+    Args:
+        logger (logging.Logger): Logger de destino
+        
+    Returns:
+        callable: Função (message, **fields) para o parâmetro log
+    """
+    def log(message, **fields):
+        level = logging.ERROR if message.startswith('✗') else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, message, extra={'fields': fields})
+    return log
+
+
+# Limite de itens por chamada de BatchWriteItem e de chaves por BatchGetItem
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+
+# Erros de throttling que justificam nova tentativa com backoff
+THROTTLING_ERRORS = ('ProvisionedThroughputExceededException',
+                     'ThrottlingException', 'RequestLimitExceeded')
+
+# Erros de criação/remoção de tabelas que justificam nova tentativa
+# (LimitExceededException: muitas operações de controle simultâneas)
+TABLE_OPERATION_RETRY_ERRORS = THROTTLING_ERRORS + ('LimitExceededException',)
+
+# Erros transitórios do serviço (além de qualquer resposta 5xx)
+TRANSIENT_ERRORS = ('InternalServerError', 'ServiceUnavailable', 'InternalFailure')
+
+# Configuração das chamadas que passam por um CapacityLimiter: sem retries do
+# botocore (o padrão repete ProvisionedThroughputExceededException até 10
+# vezes), para que cada throttling chegue ao limitador. Throttling, erros
+# transitórios e falhas de conexão são repetidos por quem chama (_retry_reason)
+LIMITED_CLIENT_CONFIG = {'retries': {'total_max_attempts': 1, 'mode': 'standard'}}
+
+
+def _backoff(attempt, base=0.05, cap=5.0):
+    """Espera com backoff exponencial e jitter completo."""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def _retry_reason(error):
+    """
+    Classifica um erro de chamada ao DynamoDB.
+
+    Returns:
+        str: 'throttling', 'transient' (5xx, conexão ou timeout) ou None
+            se o erro não deve ser repetido
+    """
+    if isinstance(error, ClientError):
+        code = error.response['Error']['Code']
+        if code in THROTTLING_ERRORS:
+            return 'throttling'
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        if code in TRANSIENT_ERRORS or status >= 500:
+            return 'transient'
+        return None
+    if isinstance(error, (BotoConnectionError, HTTPClientError)):
+        return 'transient'
+    return None
+
+
+def _item_units(item):
+    """Estima as unidades de escrita de um item (1 WCU por KB)."""
+    return max(1, math.ceil(len(json.dumps(item, default=str)) / 1024))
+
+
+def _consumed_units(response, table_name):
+    """Soma as unidades de ConsumedCapacity de uma tabela na resposta."""
+    consumed = response.get('ConsumedCapacity')
+    if consumed is None:
+        return None
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(c.get('CapacityUnits', 0) for c in consumed if c.get('TableName') == table_name)
 
 
 class DynamoDBManager:
-    def __init__(self, region='us-east-1'):
-        """Inicializa o gerenciador DynamoDB."""
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.client = boto3.client('dynamodb', region_name=region)
+    dynamodb = LazyClient('dynamodb', resource=True)
+    client = LazyClient('dynamodb')
+
+    def __init__(self, region='us-east-1', item_cache=None, log=print_log,
+                 adaptive_capacity=False):
+        """
+        Inicializa o gerenciador DynamoDB.
+        
+        Args:
+            region (str): Região AWS
+            item_cache (ItemCache): Cache de itens em processo para get_item,
+                atualizado por put_item, update_item e delete_item (opcional)
+            log (callable): Função (message, **fields) que recebe as mensagens;
+                None silencia, logging_sink(logger) gera logs estruturados
+            adaptive_capacity (bool): Limita leituras e escritas de cada tabela
+                com um CapacityLimiter (token bucket com AIMD) dimensionado
+                pela capacidade da tabela; essas chamadas não usam os retries
+                do botocore, e o throttling é tratado pelo limitador
+        """
+        self.region = region
+        self.item_cache = item_cache
+        self.log = log
+        self._key_schemas = {}
+        # Handles Table por thread, como os resources (não são thread-safe)
+        self._local = threading.local()
+        self.adaptive_capacity = adaptive_capacity
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+    def _log(self, message, **fields):
+        if self.log is not None:
+            self.log(message, **fields)
+
+    def capacity_limiter(self, table_name, kind):
+        """
+        Retorna o limitador de capacidade de leitura ou escrita da tabela.
+        
+        Args:
+            table_name (str): Nome da tabela
+            kind (str): 'read' ou 'write'
+            
+        Returns:
+            CapacityLimiter: Limitador, ou None se adaptive_capacity está desligado
+        """
+        if not self.adaptive_capacity:
+            return None
+        limiter = self._limiters.get((table_name, kind))
+        if limiter is None:
+            description = self.client.describe_table(TableName=table_name)['Table']
+            with self._limiters_lock:
+                self._key_schemas.setdefault(
+                    table_name, [k['AttributeName'] for k in description['KeySchema']]
+                )
+                for limiter_kind in ('read', 'write'):
+                    self._limiters.setdefault(
+                        (table_name, limiter_kind),
+                        CapacityLimiter.from_table_description(description, limiter_kind)
+                    )
+                limiter = self._limiters[(table_name, kind)]
+        return limiter
+
+    def _throttled(self, table_name, kind, units, call, max_retries=8, **params):
+        """
+        Executa uma chamada passando pelo limitador de capacidade da tabela.
+        
+        Sem limitador, apenas executa a chamada. Com limitador, reserva as
+        unidades estimadas, corrige com o ConsumedCapacity da resposta e,
+        em caso de throttling, reduz a taxa e tenta de novo com backoff.
+        Erros transitórios (5xx, conexão) também são repetidos, sem reduzir
+        a taxa.
+        """
+        limiter = self.capacity_limiter(table_name, kind)
+        if limiter is None:
+            return call(**params)
+        
+        params['ReturnConsumedCapacity'] = 'TOTAL'
+        for attempt in range(max_retries + 1):
+            limiter.acquire(units)
+            try:
+                response = call(**params)
+            except (ClientError, BotoCoreError) as e:
+                limiter.settle(units, 0)
+                reason = _retry_reason(e)
+                if reason is None or attempt == max_retries:
+                    raise
+                if reason == 'throttling':
+                    limiter.on_throttle()
+                _backoff(attempt)
+                continue
+            limiter.settle(units, _consumed_units(response, table_name))
+            limiter.on_success()
+            return response
+
+    def _forget_table(self, table_name):
+        """Descarta o que está em cache sobre uma tabela removida."""
+        self._thread_tables().pop(table_name, None)
+        self._key_schemas.pop(table_name, None)
+        for kind in ('read', 'write'):
+            self._limiters.pop((table_name, kind), None)
+
+    def _resource(self, limited=None):
+        """
+        Retorna o resource DynamoDB da thread atual.
+        
+        Com limitador (padrão: adaptive_capacity), o resource não repete
+        nenhuma chamada; throttling e erros transitórios são repetidos por
+        _throttled, _put_batch e _get_batch.
+        """
+        if limited is None:
+            limited = self.adaptive_capacity
+        if limited:
+            return get_resource('dynamodb', self.region, **LIMITED_CLIENT_CONFIG)
+        return self.dynamodb
+
+    def _thread_tables(self):
+        tables = getattr(self._local, 'tables', None)
+        if tables is None:
+            tables = self._local.tables = {}
+        return tables
+
+    def _table(self, table_name):
+        """Retorna o resource Table da tabela, criado uma única vez por thread."""
+        tables = self._thread_tables()
+        table = tables.get(table_name)
+        if table is None:
+            table = tables[table_name] = self._resource().Table(table_name)
+        return table
+
+    def _create_table_request(self, table_name, partition_key, sort_key=None,
+                              read_capacity=5, write_capacity=5):
+        """Envia o CreateTable sem esperar; erros são propagados."""
+        key_schema = [
+            {'AttributeName': partition_key, 'KeyType': 'HASH'}
+        ]
+        attribute_definitions = [
+            {'AttributeName': partition_key, 'AttributeType': 'S'}
+        ]
+        
+        if sort_key:
+            key_schema.append({'AttributeName': sort_key, 'KeyType': 'RANGE'})
+            attribute_definitions.append(
+                {'AttributeName': sort_key, 'AttributeType': 'S'}
+            )
+        
+        return self.dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=key_schema,
+            AttributeDefinitions=attribute_definitions,
+            BillingMode='PROVISIONED',
+            ProvisionedThroughput={
+                'ReadCapacityUnits': read_capacity,
+                'WriteCapacityUnits': write_capacity
+            }
+        )
 
     def create_table(self, table_name, partition_key, sort_key=None,
-                    read_capacity=5, write_capacity=5):
+                    read_capacity=5, write_capacity=5, wait=True):
         """
         Cria uma tabela DynamoDB.
         
@@ -24,42 +277,191 @@ class DynamoDBManager:
             sort_key (str): Chave de ordenação (opcional)
             read_capacity (int): Unidades de leitura
             write_capacity (int): Unidades de escrita
+            wait (bool): Espera a tabela ficar ACTIVE (para criar muitas
+                tabelas em paralelo, use create_tables)
             
         Returns:
             str: Nome da tabela criada
         """
         try:
-            key_schema = [
-                {'AttributeName': partition_key, 'KeyType': 'HASH'}
-            ]
-            attribute_definitions = [
-                {'AttributeName': partition_key, 'AttributeType': 'S'}
-            ]
-            
-            if sort_key:
-                key_schema.append({'AttributeName': sort_key, 'KeyType': 'RANGE'})
-                attribute_definitions.append(
-                    {'AttributeName': sort_key, 'AttributeType': 'S'}
-                )
-            
-            table = self.dynamodb.create_table(
-                TableName=table_name,
-                KeySchema=key_schema,
-                AttributeDefinitions=attribute_definitions,
-                BillingMode='PROVISIONED',
-                ProvisionedThroughput={
-                    'ReadCapacityUnits': read_capacity,
-                    'WriteCapacityUnits': write_capacity
-                }
-            )
-            
-            table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
-            print(f"✓ Tabela criada: {table_name}")
+            table = self._create_table_request(table_name, partition_key, sort_key,
+                                               read_capacity, write_capacity)
+            if wait:
+                table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
+                self._log(f"✓ Tabela criada: {table_name}")
+            else:
+                self._log(f"✓ Criação da tabela solicitada: {table_name}")
             return table_name
         except ClientError as e:
-            print(f"✗ Erro ao criar tabela: {e}")
+            self._log(f"✗ Erro ao criar tabela: {e}")
             return None
 
+    def _table_status(self, table_name):
+        """Retorna o TableStatus, 'DELETED' se não existe ou None se houve throttling."""
+        try:
+            return self.client.describe_table(TableName=table_name)['Table']['TableStatus']
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'ResourceNotFoundException':
+                return 'DELETED'
+            if code in THROTTLING_ERRORS:
+                return None
+            raise
+
+    def wait_for_tables(self, table_names, status='ACTIVE', poll_interval=5, timeout=600,
+                        max_workers=16):
+        """
+        Espera várias tabelas chegarem a um estado, consultando-as em paralelo.
+        
+        A cada rodada, todas as tabelas pendentes são consultadas ao mesmo
+        tempo (DescribeTable), então a espera total é a da tabela mais
+        lenta, e não a soma de todas.
+        
+        Args:
+            table_names (list): Nomes das tabelas
+            status (str): Estado esperado: 'ACTIVE' ou 'DELETED'
+            poll_interval (float): Segundos entre rodadas de consulta
+            timeout (float): Segundos máximos de espera
+            max_workers (int): Consultas simultâneas por rodada
+            
+        Returns:
+            dict: Tabela -> estado final ('ACTIVE', 'DELETED', 'TIMEOUT' ou
+                'FAILED' se a tabela sumiu ou a consulta falhou)
+        """
+        statuses = {}
+        pending = list(dict.fromkeys(table_names))
+        deadline = time.monotonic() + timeout
+        if not pending:
+            return statuses
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            while pending:
+                futures = [executor.submit(self._table_status, name) for name in pending]
+                still_pending = []
+                for table_name, future in zip(pending, futures):
+                    try:
+                        current = future.result()
+                    except ClientError as e:
+                        self._log(f"✗ Erro ao consultar tabela {table_name}: {e}")
+                        statuses[table_name] = 'FAILED'
+                        continue
+                    if current == status:
+                        statuses[table_name] = status
+                    elif current == 'DELETED':
+                        # Esperava ACTIVE, mas a tabela não existe
+                        statuses[table_name] = 'FAILED'
+                    else:
+                        still_pending.append(table_name)
+                pending = still_pending
+                if pending and time.monotonic() + poll_interval > deadline:
+                    for table_name in pending:
+                        statuses[table_name] = 'TIMEOUT'
+                    break
+                if pending:
+                    time.sleep(poll_interval)
+        return statuses
+
+    def _table_operation(self, operation, table_name, max_retries):
+        """Executa CreateTable/DeleteTable repetindo em caso de limite ou throttling."""
+        for attempt in range(max_retries + 1):
+            try:
+                return operation()
+            except ClientError as e:
+                if (e.response['Error']['Code'] not in TABLE_OPERATION_RETRY_ERRORS
+                        or attempt == max_retries):
+                    raise
+                _backoff(attempt, base=1.0, cap=20.0)
+
+    def _run_table_operations(self, tables, operation, accepted_errors, status, wait,
+                              max_workers, poll_interval, timeout, max_retries):
+        """Dispara as operações em paralelo e espera as tabelas em conjunto."""
+        start = time.monotonic()
+        statuses = {}
+        issued = []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tables)))) as executor:
+            futures = {
+                table_name: executor.submit(self._table_operation,
+                                            lambda spec=spec: operation(spec),
+                                            table_name, max_retries)
+                for table_name, spec in tables.items()
+            }
+            for table_name, future in futures.items():
+                try:
+                    future.result()
+                except ClientError as e:
+                    if e.response['Error']['Code'] not in accepted_errors:
+                        self._log(f"✗ Erro na tabela {table_name}: {e}")
+                        statuses[table_name] = 'FAILED'
+                        continue
+                issued.append(table_name)
+        
+        if wait:
+            statuses.update(self.wait_for_tables(issued, status, poll_interval,
+                                                 timeout, max_workers))
+            done = sum(1 for s in statuses.values() if s == status)
+            self._log(f"✓ {done}/{len(tables)} tabela(s) {status} "
+                      f"em {time.monotonic() - start:.1f}s")
+        else:
+            statuses.update({table_name: 'PENDING' for table_name in issued})
+            self._log(f"✓ {len(issued)}/{len(tables)} operação(ões) solicitada(s)")
+        return {table_name: statuses[table_name] for table_name in tables}
+
+    def create_tables(self, tables, wait=True, max_workers=16, poll_interval=5,
+                      timeout=600, max_retries=8):
+        """
+        Cria várias tabelas de uma vez e espera por todas em paralelo.
+        
+        Todos os CreateTable são enviados antes de qualquer espera. Tabelas
+        que já existem (ResourceInUseException) são apenas aguardadas, então
+        a chamada pode ser repetida com segurança.
+        
+        Args:
+            tables (list): Dicionários com os argumentos de create_table
+                (table_name, partition_key, sort_key, read_capacity, write_capacity)
+            wait (bool): Espera as tabelas ficarem ACTIVE
+            max_workers (int): Chamadas simultâneas
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas quando o limite de operações é atingido
+            
+        Returns:
+            dict: Tabela -> 'ACTIVE', 'TIMEOUT', 'FAILED' ou 'PENDING' (sem wait)
+        """
+        specs = {spec['table_name']: spec for spec in tables}
+        return self._run_table_operations(
+            specs, lambda spec: self._create_table_request(**spec),
+            ('ResourceInUseException',), 'ACTIVE', wait,
+            max_workers, poll_interval, timeout, max_retries
+        )
+
+    def delete_tables(self, table_names, wait=True, max_workers=16, poll_interval=5,
+                      timeout=600, max_retries=8):
+        """
+        Deleta várias tabelas de uma vez e espera por todas em paralelo.
+        
+        Tabelas inexistentes (ResourceNotFoundException) contam como deletadas.
+        
+        Args:
+            table_names (list): Nomes das tabelas
+            wait (bool): Espera as tabelas deixarem de existir
+            max_workers (int): Chamadas simultâneas
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas quando o limite de operações é atingido
+            
+        Returns:
+            dict: Tabela -> 'DELETED', 'TIMEOUT', 'FAILED' ou 'PENDING' (sem wait)
+        """
+        for table_name in table_names:
+            self._forget_table(table_name)
+        return self._run_table_operations(
+            {table_name: table_name for table_name in table_names},
+            lambda table_name: self.client.delete_table(TableName=table_name),
+            ('ResourceNotFoundException',), 'DELETED', wait,
+            max_workers, poll_interval, timeout, max_retries
+        )
+
     def list_tables(self):
         """
         Lista todas as tabelas.
@@ -71,7 +473,7 @@ class DynamoDBManager:
             response = self.client.list_tables()
             return response['TableNames']
         except ClientError as e:
-            print(f"✗ Erro ao listar tabelas: {e}")
+            self._log(f"✗ Erro ao listar tabelas: {e}")
             return []
 
     def put_item(self, table_name, item):
@@ -83,11 +485,147 @@ class DynamoDBManager:
             item (dict): Item a inserir
         """
         try:
-            table = self.dynamodb.Table(table_name)
-            table.put_item(Item=item)
-            print(f"✓ Item inserido na tabela {table_name}")
+            table = self._table(table_name)
+            self._throttled(table_name, 'write', _item_units(item), table.put_item, Item=item)
+            if self.item_cache:
+                key = {k: item[k] for k in self._key_names(table_name)}
+                self.item_cache.put(table_name, key, item)
+            self._log(f"✓ Item inserido na tabela {table_name}",
+                      event='put_item', table=table_name)
         except ClientError as e:
-            print(f"✗ Erro ao inserir item: {e}")
+            self._log(f"✗ Erro ao inserir item: {e}")
+
+    def _key_names(self, table_name):
+        """Retorna (e guarda em cache) os nomes dos atributos de chave da tabela."""
+        if table_name not in self._key_schemas:
+            response = self.client.describe_table(TableName=table_name)
+            self._key_schemas[table_name] = [
+                k['AttributeName'] for k in response['Table']['KeySchema']
+            ]
+        return self._key_schemas[table_name]
+
+    def _write_batch(self, table_name, batch, limiter, max_retries):
+        """Grava um lote de até 25 itens e invalida suas chaves no item_cache."""
+        try:
+            return self._put_batch(table_name, batch, limiter, max_retries)
+        finally:
+            # Invalida só depois da escrita: um get_item concorrente durante
+            # o envio não deixa o valor antigo no cache
+            if self.item_cache:
+                key_names = self._key_names(table_name)
+                for item in batch:
+                    self.item_cache.invalidate(table_name, {k: item[k] for k in key_names})
+
+    def _put_batch(self, table_name, batch, limiter, max_retries):
+        """Grava um lote de até 25 itens, repetindo os UnprocessedItems."""
+        requests = [{'PutRequest': {'Item': item}} for item in batch]
+        params = {'ReturnConsumedCapacity': 'TOTAL'} if limiter else {}
+        for attempt in range(max_retries + 1):
+            units = 0
+            if limiter:
+                units = sum(_item_units(r['PutRequest']['Item']) for r in requests)
+                limiter.acquire(units)
+            try:
+                response = self._resource(limiter is not None).meta.client.batch_write_item(
+                    RequestItems={table_name: requests}, **params
+                )
+            except (ClientError, BotoCoreError) as e:
+                if limiter:
+                    limiter.settle(units, 0)
+                reason = _retry_reason(e)
+                if reason is None:
+                    self._log(f"✗ Erro ao gravar lote: {e}")
+                    return len(batch) - len(requests), len(requests)
+                if limiter and reason == 'throttling':
+                    limiter.on_throttle()
+            else:
+                requests = response.get('UnprocessedItems', {}).get(table_name, [])
+                if limiter:
+                    limiter.settle(units, _consumed_units(response, table_name))
+                    # Itens não processados indicam throttling parcial
+                    if requests:
+                        limiter.on_throttle()
+                    else:
+                        limiter.on_success()
+                if not requests:
+                    return len(batch), 0
+            if attempt < max_retries:
+                _backoff(attempt)
+        return len(batch) - len(requests), len(requests)
+
+    def batch_write_items(self, table_name, items, max_workers=4, wcu_per_second=None,
+                          max_retries=8, report_every=10.0):
+        """
+        Grava muitos itens em lotes de 25 (BatchWriteItem) com várias threads.
+        
+        Itens com a mesma chave dentro de um lote são deduplicados (vale o
+        último). UnprocessedItems são reenviados com backoff exponencial com
+        jitter. Com wcu_per_second, a taxa de escrita (estimada em 1 WCU por
+        KB de item) é limitada entre todas as threads; sem ele e com
+        adaptive_capacity, vale o limitador adaptativo da tabela.
+        
+        Args:
+            table_name (str): Nome da tabela
+            items (iterable): Itens a gravar (consumidos sob demanda)
+            max_workers (int): Número de threads de escrita
+            wcu_per_second (float): Orçamento de WCU por segundo (opcional)
+            max_retries (int): Tentativas para itens não processados
+            report_every (float): Intervalo em segundos entre relatórios de progresso
+            
+        Returns:
+            dict: Resumo com 'total', 'written', 'failed', 'duplicates',
+                'seconds' e 'items_per_second'
+        """
+        key_names = self._key_names(table_name)
+        if wcu_per_second:
+            limiter = CapacityLimiter(wcu_per_second, adaptive=False)
+        else:
+            limiter = self.capacity_limiter(table_name, 'write')
+        summary = {'total': 0, 'written': 0, 'failed': 0, 'duplicates': 0}
+        lock = threading.Lock()
+        # Limita os lotes pendentes para não consumir o iterável inteiro
+        pending = threading.BoundedSemaphore(max_workers * 2)
+        start = time.monotonic()
+        last_report = start
+        
+        def done(future, size):
+            nonlocal last_report
+            try:
+                written, failed = future.result()
+            except Exception as e:
+                self._log(f"✗ Erro ao gravar lote: {e}")
+                written, failed = 0, size
+            with lock:
+                summary['written'] += written
+                summary['failed'] += failed
+                now = time.monotonic()
+                if now - last_report >= report_every:
+                    last_report = now
+                    rate = summary['written'] / (now - start)
+                    self._log(f"  {summary['written']} itens gravados ({rate:.0f} itens/s)")
+            pending.release()
+        
+        iterator = iter(items)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                chunk = list(islice(iterator, BATCH_WRITE_SIZE))
+                if not chunk:
+                    break
+                batch = {tuple(item[k] for k in key_names): item for item in chunk}
+                summary['total'] += len(chunk)
+                summary['duplicates'] += len(chunk) - len(batch)
+                
+                pending.acquire()
+                future = executor.submit(self._write_batch, table_name,
+                                         list(batch.values()), limiter, max_retries)
+                future.add_done_callback(lambda f, size=len(batch): done(f, size))
+        
+        elapsed = time.monotonic() - start
+        summary['seconds'] = round(elapsed, 2)
+        summary['items_per_second'] = round(summary['written'] / elapsed, 1) if elapsed else 0
+        self._log(f"✓ {summary['written']} item(ns) gravado(s) em {table_name} "
+                  f"({summary['items_per_second']} itens/s, {summary['failed']} falha(s))")
+        return summary
 
     def get_item(self, table_name, key):
         """
@@ -100,18 +638,192 @@ class DynamoDBManager:
         Returns:
             dict: Item encontrado
         """
+        if self.item_cache:
+            cached = self.item_cache.get(table_name, key)
+            if cached is not None:
+                return None if cached is MISSING else cached
+        
+        try:
+            table = self._table(table_name)
+            response = self._throttled(table_name, 'read', 0.5, table.get_item, Key=key)
+            item = response.get('Item', None)
+            if self.item_cache:
+                self.item_cache.put(table_name, key, item)
+            return item
+        except ClientError as e:
+            self._log(f"✗ Erro ao obter item: {e}")
+            return None
+
+    def get_item_raw(self, table_name, key, projection_expression=None,
+                     consistent_read=False):
+        """
+        Obtém um item pelo cliente de baixo nível, sem (de)serialização de tipos.
+        
+        Chave e item usam o formato de AttributeValue do DynamoDB, ex:
+        {'user_id': {'S': 'user123'}}. Evita o custo do TypeSerializer/
+        TypeDeserializer do resource em laços com muitas chamadas. Não passa
+        pelo item_cache.
+        
+        Args:
+            table_name (str): Nome da tabela
+            key (dict): Chave no formato AttributeValue
+            projection_expression (str): Atributos a retornar (opcional)
+            consistent_read (bool): Leitura fortemente consistente
+            
+        Returns:
+            dict: Item no formato AttributeValue, ou None
+        """
+        params = {'TableName': table_name, 'Key': key}
+        if projection_expression:
+            params['ProjectionExpression'] = projection_expression
+        if consistent_read:
+            params['ConsistentRead'] = True
         try:
-            table = self.dynamodb.Table(table_name)
-            response = table.get_item(Key=key)
-            return response.get('Item', None)
+            return self.client.get_item(**params).get('Item')
         except ClientError as e:
-            print(f"✗ Erro ao obter item: {e}")
+            self._log(f"✗ Erro ao obter item: {e}")
             return None
 
+    def put_item_raw(self, table_name, item):
+        """
+        Insere um item pelo cliente de baixo nível, sem serialização de tipos.
+        
+        Não passa pelo item_cache.
+        
+        Args:
+            table_name (str): Nome da tabela
+            item (dict): Item no formato AttributeValue
+            
+        Returns:
+            bool: True se inserido com sucesso
+        """
+        try:
+            self.client.put_item(TableName=table_name, Item=item)
+            return True
+        except ClientError as e:
+            self._log(f"✗ Erro ao inserir item: {e}")
+            return False
+
+    def _get_batch(self, chunk, consistent_read, max_retries):
+        """
+        Lê até 100 chaves (de uma ou mais tabelas), repetindo UnprocessedKeys.
+        
+        Returns:
+            tuple: (identidade -> item encontrado, pares (table_name, key)
+                que não puderam ser lidos)
+        """
+        request_items = {}
+        for table_name, key in chunk:
+            entry = request_items.setdefault(
+                table_name, {'Keys': [], 'ConsistentRead': consistent_read}
+            )
+            entry['Keys'].append(key)
+        
+        limiters = {}
+        for table_name in request_items:
+            limiter = self.capacity_limiter(table_name, 'read')
+            if limiter:
+                limiters[table_name] = limiter
+        params = {'ReturnConsumedCapacity': 'TOTAL'} if limiters else {}
+        # Estimativa: itens de até 4 KB (0,5 RCU em leitura eventual)
+        units_per_key = 1 if consistent_read else 0.5
+        
+        found = {}
+        for attempt in range(max_retries + 1):
+            reserved = {}
+            for table_name, limiter in limiters.items():
+                if table_name in request_items:
+                    reserved[table_name] = len(request_items[table_name]['Keys']) * units_per_key
+                    limiter.acquire(reserved[table_name])
+            try:
+                response = self._resource(bool(limiters)).meta.client.batch_get_item(
+                    RequestItems=request_items, **params
+                )
+            except (ClientError, BotoCoreError) as e:
+                for table_name, units in reserved.items():
+                    limiters[table_name].settle(units, 0)
+                reason = _retry_reason(e)
+                if reason is None:
+                    self._log(f"✗ Erro ao ler lote: {e}")
+                    break
+                if reason == 'throttling':
+                    for table_name in reserved:
+                        limiters[table_name].on_throttle()
+            else:
+                for table_name, items in response.get('Responses', {}).items():
+                    key_names = self._key_names(table_name)
+                    for item in items:
+                        found[(table_name, tuple(item[k] for k in key_names))] = item
+                request_items = response.get('UnprocessedKeys', {})
+                for table_name, units in reserved.items():
+                    limiter = limiters[table_name]
+                    limiter.settle(units, _consumed_units(response, table_name))
+                    if table_name in request_items:
+                        limiter.on_throttle()
+                    else:
+                        limiter.on_success()
+                if not request_items:
+                    break
+            if attempt < max_retries:
+                _backoff(attempt)
+        failed = [(table_name, key) for table_name, entry in request_items.items()
+                  for key in entry['Keys']]
+        return found, failed
+
+    def batch_get_items(self, requests, max_workers=4, consistent_read=False,
+                        max_retries=8):
+        """
+        Lê muitos itens por chave com BatchGetItem, em paralelo.
+        
+        As chaves (de uma ou mais tabelas) são agrupadas em requisições de
+        até 100 chaves; chaves repetidas são pedidas uma única vez e
+        UnprocessedKeys são repetidas com backoff. Chaves que não puderam ser
+        lidas (erro da API ou UnprocessedKeys após max_retries) vêm em
+        'failed', separadas das inexistentes.
+        
+        Args:
+            requests (iterable): Pares (table_name, key)
+            max_workers (int): Número de requisições simultâneas
+            consistent_read (bool): Usa leitura fortemente consistente
+            max_retries (int): Tentativas para chaves não processadas
+            
+        Returns:
+            dict: 'items' com os itens na mesma ordem da entrada (None se não
+                encontrado ou não lido) e 'failed' com os pares (table_name,
+                key) não lidos
+        """
+        requests = list(requests)
+        identities = [
+            (table_name, tuple(key[k] for k in self._key_names(table_name)))
+            for table_name, key in requests
+        ]
+        keys = {}
+        for identity, (table_name, key) in zip(identities, requests):
+            keys.setdefault(identity, (table_name, key))
+        
+        unique = list(keys.values())
+        chunks = [unique[i:i + BATCH_GET_SIZE] for i in range(0, len(unique), BATCH_GET_SIZE)]
+        found = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_found, chunk_failed in executor.map(
+                lambda chunk: self._get_batch(chunk, consistent_read, max_retries), chunks
+            ):
+                found.update(chunk_found)
+                failed.extend(chunk_failed)
+        
+        if failed:
+            self._log(f"✗ {len(failed)} chave(s) não lida(s)", event='batch_get_items',
+                      failed=len(failed))
+        return {'items': [found.get(identity) for identity in identities], 'failed': failed}
+
     def scan(self, table_name, filter_expression=None):
         """
         Escaneia todos os itens da tabela.
         
+        Percorre todas as páginas; para tabelas grandes prefira iter_scan
+        ou parallel_scan, que não mantêm o resultado inteiro em memória.
+        
         Args:
             table_name (str): Nome da tabela
             filter_expression: Expressão de filtro (opcional)
@@ -119,17 +831,116 @@ class DynamoDBManager:
         Returns:
             list: Lista de itens
         """
-        try:
-            table = self.dynamodb.Table(table_name)
-            params = {}
-            if filter_expression:
-                params['FilterExpression'] = filter_expression
+        return list(self.iter_scan(table_name, filter_expression))
+
+    def iter_scan(self, table_name, filter_expression=None, projection_expression=None,
+                  expression_attribute_names=None, expression_attribute_values=None,
+                  segment=None, total_segments=None, page_size=None,
+                  exclusive_start_key=None):
+        """
+        Escaneia a tabela página a página, gerando os itens sob demanda.
+        
+        Filtro e projeção são aplicados no servidor, reduzindo o volume
+        transferido (a capacidade lida continua sendo a dos itens brutos).
+        
+        Args:
+            table_name (str): Nome da tabela
+            filter_expression: Expressão de filtro (opcional)
+            projection_expression (str): Atributos a retornar (opcional)
+            expression_attribute_names (dict): Apelidos de atributos (#nome)
+            expression_attribute_values (dict): Valores da expressão (:valor)
+            segment (int): Segmento deste scan, em scans paralelos
+            total_segments (int): Total de segmentos, em scans paralelos
+            page_size (int): Itens avaliados por requisição (Limit)
+            exclusive_start_key (dict): Chave para retomar um scan anterior
             
-            response = table.scan(**params)
-            return response.get('Items', [])
+        Yields:
+            dict: Itens da tabela
+        """
+        try:
+            for items, _ in self.iter_scan_pages(
+                table_name, filter_expression, projection_expression,
+                expression_attribute_names, expression_attribute_values,
+                segment, total_segments, page_size, exclusive_start_key
+            ):
+                yield from items
         except ClientError as e:
-            print(f"✗ Erro ao escanear tabela: {e}")
-            return []
+            self._log(f"✗ Erro ao escanear tabela: {e}")
+
+    def iter_scan_pages(self, table_name, filter_expression=None, projection_expression=None,
+                        expression_attribute_names=None, expression_attribute_values=None,
+                        segment=None, total_segments=None, page_size=None,
+                        exclusive_start_key=None):
+        """
+        Escaneia a tabela gerando cada página com a chave para continuar.
+        
+        Aceita os mesmos argumentos de iter_scan. Diferente dele, erros do
+        DynamoDB são propagados, para que quem retoma scans (ex: exportações
+        com checkpoint) não confunda uma falha com o fim da tabela.
+        
+        Yields:
+            tuple: (itens da página, LastEvaluatedKey ou None na última página)
+        """
+        params = {}
+        if filter_expression:
+            params['FilterExpression'] = filter_expression
+        if projection_expression:
+            params['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            params['ExpressionAttributeNames'] = expression_attribute_names
+        if expression_attribute_values:
+            params['ExpressionAttributeValues'] = expression_attribute_values
+        if total_segments:
+            params['Segment'] = segment
+            params['TotalSegments'] = total_segments
+        if page_size:
+            params['Limit'] = page_size
+        if exclusive_start_key:
+            params['ExclusiveStartKey'] = exclusive_start_key
+        
+        table = self._table(table_name)
+        units = 1
+        while True:
+            response = self._throttled(table_name, 'read', units, table.scan, **params)
+            units = _consumed_units(response, table_name) or units
+            last_key = response.get('LastEvaluatedKey')
+            yield response.get('Items', []), last_key
+            if not last_key:
+                break
+            params['ExclusiveStartKey'] = last_key
+
+    def parallel_scan(self, table_name, total_segments=4, max_workers=None,
+                      max_buffered=1000, **scan_kwargs):
+        """
+        Escaneia a tabela com Segment/TotalSegments em várias threads.
+        
+        Os itens de todos os segmentos passam por uma fila limitada, então
+        a memória fica constante mesmo em exportações completas. A ordem
+        entre segmentos não é garantida. Um erro do DynamoDB em qualquer
+        segmento é propagado ao consumidor (ClientError), em vez de encerrar
+        o segmento como se tivesse chegado ao fim.
+        
+        Args:
+            table_name (str): Nome da tabela
+            total_segments (int): Número de segmentos do scan
+            max_workers (int): Threads simultâneas (padrão: total_segments)
+            max_buffered (int): Máximo de itens aguardando o consumidor
+            **scan_kwargs: Argumentos de iter_scan (filtro, projeção etc.)
+            
+        Yields:
+            dict: Itens da tabela
+        """
+        producers = [
+            lambda segment=segment: (
+                item
+                for items, _ in self.iter_scan_pages(
+                    table_name, segment=segment, total_segments=total_segments, **scan_kwargs
+                )
+                for item in items
+            )
+            for segment in range(total_segments)
+        ]
+        yield from iter_parallel(producers, max_workers or total_segments, max_buffered)
 
     def update_item(self, table_name, key, update_expression, attribute_values):
         """
@@ -142,15 +953,22 @@ class DynamoDBManager:
             attribute_values (dict): Valores dos atributos
         """
         try:
-            table = self.dynamodb.Table(table_name)
-            table.update_item(
-                Key=key,
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=attribute_values
-            )
-            print(f"✓ Item atualizado na tabela {table_name}")
+            table = self._table(table_name)
+            params = {
+                'Key': key,
+                'UpdateExpression': update_expression,
+                'ExpressionAttributeValues': attribute_values
+            }
+            if self.item_cache:
+                # Com cache, o item atualizado volta na própria resposta
+                params['ReturnValues'] = 'ALL_NEW'
+            response = self._throttled(table_name, 'write', 1, table.update_item, **params)
+            if self.item_cache:
+                self.item_cache.put(table_name, key, response.get('Attributes'))
+            self._log(f"✓ Item atualizado na tabela {table_name}",
+                      event='update_item', table=table_name)
         except ClientError as e:
-            print(f"✗ Erro ao atualizar item: {e}")
+            self._log(f"✗ Erro ao atualizar item: {e}")
 
     def delete_item(self, table_name, key):
         """
@@ -161,48 +979,166 @@ class DynamoDBManager:
             key (dict): Chave do item
         """
         try:
-            table = self.dynamodb.Table(table_name)
-            table.delete_item(Key=key)
-            print(f"✓ Item deletado da tabela {table_name}")
+            table = self._table(table_name)
+            self._throttled(table_name, 'write', 1, table.delete_item, Key=key)
+            if self.item_cache:
+                self.item_cache.put(table_name, key, None)
+            self._log(f"✓ Item deletado da tabela {table_name}",
+                      event='delete_item', table=table_name)
         except ClientError as e:
-            print(f"✗ Erro ao deletar item: {e}")
+            self._log(f"✗ Erro ao deletar item: {e}")
 
-    def query(self, table_name, partition_key_value, partition_key_name):
+    def query(self, table_name, partition_key_value, partition_key_name, **query_kwargs):
         """
         Consulta itens com a mesma chave de partição.
         
+        Percorre todas as páginas; para coleções grandes prefira iter_query.
+        
         Args:
             table_name (str): Nome da tabela
             partition_key_value (str): Valor da chave de partição
             partition_key_name (str): Nome da chave de partição
+            **query_kwargs: Argumentos de iter_query (sort_key_condition,
+                index_name, limit etc.)
             
         Returns:
             list: Items encontrados
         """
+        return list(self.iter_query(table_name, partition_key_value, partition_key_name,
+                                    **query_kwargs))
+
+    def iter_query(self, table_name, partition_key_value, partition_key_name,
+                   sort_key_condition=None, index_name=None, limit=None,
+                   projection_expression=None, expression_attribute_names=None,
+                   filter_expression=None, scan_index_forward=True, page_size=None,
+                   exclusive_start_key=None, consistent_read=False):
+        """
+        Consulta uma partição página a página, gerando os itens sob demanda.
+        
+        Args:
+            table_name (str): Nome da tabela
+            partition_key_value: Valor da chave de partição
+            partition_key_name (str): Nome da chave de partição (da tabela ou do índice)
+            sort_key_condition: Condição sobre a chave de ordenação, ex:
+                Key('data').between('2024-01', '2024-06') (opcional)
+            index_name (str): GSI ou LSI a consultar (opcional)
+            limit (int): Máximo de itens retornados no total (opcional)
+            projection_expression (str): Atributos a retornar (opcional)
+            expression_attribute_names (dict): Apelidos de atributos (#nome)
+            filter_expression: Filtro aplicado após a leitura (opcional)
+            scan_index_forward (bool): False para ordem decrescente da chave de ordenação
+            page_size (int): Itens lidos por requisição
+            exclusive_start_key (dict): Chave para retomar uma consulta anterior
+            consistent_read (bool): Leitura fortemente consistente (não vale para GSI)
+            
+        Yields:
+            dict: Itens encontrados
+        """
         try:
-            table = self.dynamodb.Table(table_name)
-            response = table.query(
-                KeyConditionExpression=f'{partition_key_name} = :pk',
-                ExpressionAttributeValues={':pk': partition_key_value}
+            yield from self._iter_query(
+                table_name, partition_key_value, partition_key_name, sort_key_condition,
+                index_name, limit, projection_expression, expression_attribute_names,
+                filter_expression, scan_index_forward, page_size, exclusive_start_key,
+                consistent_read
             )
-            return response.get('Items', [])
         except ClientError as e:
-            print(f"✗ Erro ao consultar tabela: {e}")
-            return []
+            self._log(f"✗ Erro ao consultar tabela: {e}")
+
+    def _iter_query(self, table_name, partition_key_value, partition_key_name,
+                    sort_key_condition=None, index_name=None, limit=None,
+                    projection_expression=None, expression_attribute_names=None,
+                    filter_expression=None, scan_index_forward=True, page_size=None,
+                    exclusive_start_key=None, consistent_read=False):
+        """Como iter_query, mas propaga ClientError."""
+        from boto3.dynamodb.conditions import Key
+        
+        key_condition = Key(partition_key_name).eq(partition_key_value)
+        if sort_key_condition is not None:
+            key_condition = key_condition & sort_key_condition
+        
+        params = {
+            'KeyConditionExpression': key_condition,
+            'ScanIndexForward': scan_index_forward
+        }
+        if index_name:
+            params['IndexName'] = index_name
+        if projection_expression:
+            params['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            params['ExpressionAttributeNames'] = expression_attribute_names
+        if filter_expression is not None:
+            params['FilterExpression'] = filter_expression
+        if exclusive_start_key:
+            params['ExclusiveStartKey'] = exclusive_start_key
+        if consistent_read:
+            params['ConsistentRead'] = True
+        
+        remaining = limit
+        units = 1
+        table = self._table(table_name)
+        while remaining is None or remaining > 0:
+            page_limit = page_size
+            if remaining is not None:
+                page_limit = min(remaining, page_size or remaining)
+            if page_limit:
+                params['Limit'] = page_limit
+            
+            response = self._throttled(table_name, 'read', units, table.query, **params)
+            units = _consumed_units(response, table_name) or units
+            items = response.get('Items', [])
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            yield from items
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            params['ExclusiveStartKey'] = last_key
+
+    def query_many(self, table_name, partition_key_name, partition_key_values,
+                   max_workers=8, max_buffered=1000, **query_kwargs):
+        """
+        Consulta várias partições em paralelo, gerando os itens conforme chegam.
+        
+        Um erro do DynamoDB em qualquer partição é propagado ao consumidor
+        (ClientError), em vez de encerrar a partição como se estivesse completa.
+        
+        Args:
+            table_name (str): Nome da tabela
+            partition_key_name (str): Nome da chave de partição
+            partition_key_values (iterable): Valores de chave de partição
+            max_workers (int): Número de consultas simultâneas
+            max_buffered (int): Máximo de itens aguardando o consumidor
+            **query_kwargs: Argumentos de iter_query aplicados a cada partição
+            
+        Yields:
+            dict: Itens encontrados, sem ordem garantida entre partições
+        """
+        producers = [
+            lambda value=value: self._iter_query(table_name, value, partition_key_name,
+                                                 **query_kwargs)
+            for value in partition_key_values
+        ]
+        yield from iter_parallel(producers, max_workers, max_buffered)
 
-    def delete_table(self, table_name):
+    def delete_table(self, table_name, wait=False):
         """
         Deleta uma tabela.
         
         Args:
             table_name (str): Nome da tabela
+            wait (bool): Espera a tabela deixar de existir (para várias
+                tabelas em paralelo, use delete_tables)
         """
         try:
-            table = self.dynamodb.Table(table_name)
-            table.delete()
-            print(f"✓ Tabela deletada: {table_name}")
+            self.client.delete_table(TableName=table_name)
+            self._forget_table(table_name)
+            if wait:
+                self.client.get_waiter('table_not_exists').wait(TableName=table_name)
+            self._log(f"✓ Tabela deletada: {table_name}")
         except ClientError as e:
-            print(f"✗ Erro ao deletar tabela: {e}")
+            self._log(f"✗ Erro ao deletar tabela: {e}")
 
     def enable_billing_mode(self, table_name):
         """
@@ -216,9 +1152,9 @@ class DynamoDBManager:
                 TableName=table_name,
                 BillingMode='PAY_PER_REQUEST'
             )
-            print(f"✓ Modo de cobrança alterado para PAY_PER_REQUEST")
+            self._log(f"✓ Modo de cobrança alterado para PAY_PER_REQUEST")
         except ClientError as e:
-            print(f"✗ Erro ao alterar modo de cobrança: {e}")
+            self._log(f"✗ Erro ao alterar modo de cobrança: {e}")
 
 
 # Exemplo de uso
@@ -0,0 +1,150 @@
+"""
+Cache de itens em processo para o DynamoDBManager (semelhante ao DAX).
+
+Mantém itens por tabela/chave com despejo LRU (por quantidade e por
+tamanho estimado) e expiração por TTL. Chaves inexistentes também são
+guardadas (cache negativo), com um TTL próprio, para evitar leituras
+repetidas de itens que não existem. Os itens são copiados ao gravar e ao
+ler, então alterar um item devolvido (ou já gravado) não muda o cache.
+"""
+
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
+
+MB = 1024 * 1024
+
+# Marcador de item inexistente no cache negativo
+MISSING = object()
+
+
+class ItemCache:
+    def __init__(self, max_items=10000, max_bytes=64 * MB, ttl=60, negative_ttl=5):
+        """
+        Inicializa o cache de itens.
+
+        Args:
+            max_items (int): Máximo de entradas mantidas
+            max_bytes (int): Máximo de bytes (estimados) mantidos
+            ttl (float): Segundos de validade de um item
+            negative_ttl (float): Segundos de validade de um item inexistente
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(table_name, key):
+        return (table_name, tuple(sorted(key.items())))
+
+    @staticmethod
+    def _size(item):
+        if item is MISSING:
+            return 64
+        return len(json.dumps(item, default=str))
+
+    def get(self, table_name, key):
+        """
+        Obtém um item do cache.
+
+        Args:
+            table_name (str): Nome da tabela
+            key (dict): Chave do item
+
+        Returns:
+            dict, MISSING ou None: o item, MISSING se a chave é sabidamente
+                inexistente, ou None se não está no cache
+        """
+        cache_key = self._cache_key(table_name, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            item, expires_at, size = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[cache_key]
+                self._bytes -= size
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            if item is MISSING:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return item if item is MISSING else copy.deepcopy(item)
+
+    def put(self, table_name, key, item):
+        """
+        Grava um item no cache (write-through).
+
+        Args:
+            table_name (str): Nome da tabela
+            key (dict): Chave do item
+            item (dict): Item completo, ou None para registrar que não existe
+        """
+        if item is None:
+            item = MISSING
+        ttl = self.negative_ttl if item is MISSING else self.ttl
+        if not ttl:
+            self.invalidate(table_name, key)
+            return
+        if item is not MISSING:
+            item = copy.deepcopy(item)
+
+        cache_key = self._cache_key(table_name, key)
+        size = self._size(item)
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[cache_key] = (item, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, table_name, key):
+        """Remove um item do cache."""
+        with self._lock:
+            entry = self._entries.pop(self._cache_key(table_name, key), None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self):
+        """Esvazia o cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Acertos, acertos negativos, faltas, despejos, entradas e bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
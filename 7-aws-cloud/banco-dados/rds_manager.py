@@ -2,14 +2,20 @@
 Script para gerenciar instâncias RDS na AWS.
 """
 
-import boto3
+import os
+import sys
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class RDSManager:
+    rds_client = LazyClient('rds')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador RDS."""
-        self.rds_client = boto3.client('rds', region_name=region)
+        self.region = region
 
     def create_db_instance(self, engine, db_instance_identifier, 
                           master_username='admin', master_user_password='',
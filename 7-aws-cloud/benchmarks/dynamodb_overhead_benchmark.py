@@ -0,0 +1,121 @@
+"""
+Micro-benchmark do custo por operação no DynamoDBManager.
+
+As requisições são interceptadas no evento 'before-send' do botocore e
+respondidas localmente, então o tempo medido é só o overhead no cliente
+(montagem da requisição, (de)serialização, logging) — sem rede e sem
+credenciais reais.
+
+Compara, para get_item e put_item:
+- antes: Table() criado a cada chamada + print no stdout
+- tabela_cache: DynamoDBManager com handle de tabela em cache e log=None
+- cliente_baixo_nivel: get_item_raw/put_item_raw (sem TypeSerializer)
+
+Uso:
+    python benchmarks/dynamodb_overhead_benchmark.py [--ops 5000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'banco-dados'))
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+
+from botocore.awsrequest import AWSResponse
+from dynamodb_manager import DynamoDBManager
+
+TABLE = 'benchmark'
+ITEM = {'user_id': 'user123', 'nome': 'João Silva', 'idade': 30, 'tags': ['a', 'b']}
+RAW_ITEM = {
+    'user_id': {'S': 'user123'},
+    'nome': {'S': 'João Silva'},
+    'idade': {'N': '30'},
+    'tags': {'L': [{'S': 'a'}, {'S': 'b'}]}
+}
+RESPONSES = {
+    'GetItem': json.dumps({'Item': RAW_ITEM}).encode('utf-8'),
+    'PutItem': b'{}'
+}
+
+
+class _FakeRaw:
+    def __init__(self, body):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+def _fake_send(request, **kwargs):
+    operation = request.headers['X-Amz-Target'].decode().split('.')[-1]
+    return AWSResponse(request.url, 200, {}, _FakeRaw(RESPONSES[operation]))
+
+
+def _stub(client):
+    client.meta.events.register('before-send.dynamodb', _fake_send)
+
+
+def timed(function, ops):
+    """Executa a função ops vezes e retorna microssegundos por operação."""
+    start = time.perf_counter()
+    for _ in range(ops):
+        function()
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Overhead por operação no DynamoDBManager')
+    parser.add_argument('--ops', type=int, default=5000, help='Operações por caso')
+    args = parser.parse_args()
+
+    manager = DynamoDBManager(region='us-east-1', log=None)
+    _stub(manager.client)
+    _stub(manager.dynamodb.meta.client)
+    # Esquema de chave em cache, para não chamar DescribeTable
+    manager._key_schemas[TABLE] = ['user_id']
+    key = {'user_id': 'user123'}
+    raw_key = {'user_id': {'S': 'user123'}}
+
+    def before_get():
+        manager.dynamodb.Table(TABLE).get_item(Key=key).get('Item')
+
+    def before_put():
+        manager.dynamodb.Table(TABLE).put_item(Item=ITEM)
+        print(f"✓ Item inserido na tabela {TABLE}")
+
+    cases = {
+        'get_item': [
+            ('antes', before_get),
+            ('tabela_cache', lambda: manager.get_item(TABLE, key)),
+            ('cliente_baixo_nivel', lambda: manager.get_item_raw(TABLE, raw_key)),
+        ],
+        'put_item': [
+            ('antes', before_put),
+            ('tabela_cache', lambda: manager.put_item(TABLE, ITEM)),
+            ('cliente_baixo_nivel', lambda: manager.put_item_raw(TABLE, RAW_ITEM)),
+        ],
+    }
+
+    print(f"{'operação':<10}{'caso':<22}{'µs/op':>10}{'ganho':>10}")
+    print('-' * 52)
+    with open(os.devnull, 'w') as devnull:
+        for operation, variants in cases.items():
+            baseline = None
+            for name, function in variants:
+                # Aquecimento: carrega modelos e preenche caches
+                with contextlib.redirect_stdout(devnull):
+                    timed(function, 50)
+                    micros = timed(function, args.ops)
+                baseline = baseline or micros
+                print(f"{operation:<10}{name:<22}{micros:>10.1f}{baseline / micros:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
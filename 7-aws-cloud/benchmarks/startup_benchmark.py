@@ -0,0 +1,98 @@
+"""
+Benchmark de inicialização dos gerenciadores AWS.
+
+Para cada gerenciador, executa um interpretador novo e mede:
+- import: tempo para importar o módulo do gerenciador
+- construcao: tempo do construtor
+- primeiro_cliente: tempo do primeiro acesso a um cliente (import do
+  boto3, carga do modelo do serviço e criação do cliente); "-" para
+  gerenciadores sem atributo LazyClient
+
+Nenhuma chamada de API é feita, então não são necessárias credenciais.
+
+Uso:
+    python benchmarks/startup_benchmark.py [--repeat 5] [gerenciador ...]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from managers import MANAGERS
+
+# Executado em um processo novo para medir o custo "a frio"
+PROBE = '''
+import sys, time, json
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from managers import get_manager_class
+from aws_clients import LazyClient
+cls = get_manager_class({name!r})
+imported = time.perf_counter()
+manager = cls(region='us-east-1')
+constructed = time.perf_counter()
+attr = next((n for n, v in vars(cls).items() if isinstance(v, LazyClient)), None)
+if attr:
+    getattr(manager, attr)
+first_client = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'construcao': constructed - imported,
+    'primeiro_cliente': first_client - constructed if attr else None
+}}))
+'''
+
+
+def measure(name, repeat):
+    """
+    Mede um gerenciador em processos novos.
+
+    Args:
+        name (str): Nome do gerenciador
+        repeat (int): Número de execuções
+
+    Returns:
+        dict: Mediana de cada métrica em milissegundos ('-' se não se
+            aplica), ou {'erro': ...}
+    """
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(root=ROOT, name=name)],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return {'erro': result.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    stats = {}
+    for metric in ('import', 'construcao', 'primeiro_cliente'):
+        values = [s[metric] for s in samples if s[metric] is not None]
+        stats[metric] = round(statistics.median(values) * 1000, 1) if values else '-'
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inicialização dos gerenciadores')
+    parser.add_argument('managers', nargs='*', default=list(MANAGERS),
+                        help='Gerenciadores a medir (padrão: todos)')
+    parser.add_argument('--repeat', type=int, default=5, help='Execuções por gerenciador')
+    args = parser.parse_args()
+
+    print(f"{'gerenciador':<18}{'import (ms)':>14}{'construcao (ms)':>18}{'1º cliente (ms)':>18}")
+    print('-' * 68)
+    for name in args.managers:
+        stats = measure(name, args.repeat)
+        if 'erro' in stats:
+            print(f"{name:<18}  ✗ {stats['erro']}")
+            continue
+        print(f"{name:<18}{stats['import']:>14}{stats['construcao']:>18}{stats['primeiro_cliente']:>18}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,21 +2,151 @@
 Script para criar e gerenciar instâncias EC2 na AWS.
 """
 
-import boto3
+import os
+import sys
 import json
-from botocore.exceptions import ClientError
+import time
+import uuid
+import random
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient, get_client
+from parallel import iter_parallel
+
+
+# Máximo de IDs por chamada de start/stop/terminate e describe_instance_status
+INSTANCE_BATCH_SIZE = 100
+
+# Máximo de valores do filtro instance-id por chamada de describe_instances
+DESCRIBE_BATCH_SIZE = 200
+
+# Erros de throttling da API do EC2 que justificam nova tentativa
+THROTTLING_ERRORS = ('RequestLimitExceeded', 'Throttling', 'ThrottlingException')
+
+# Erros de RunInstances que justificam nova tentativa com backoff
+LAUNCH_RETRY_ERRORS = THROTTLING_ERRORS + ('InsufficientInstanceCapacity',)
+
+# Ação em lote -> (método do cliente, estado final da instância)
+INSTANCE_ACTIONS = {
+    'start': ('start_instances', 'running'),
+    'stop': ('stop_instances', 'stopped'),
+    'terminate': ('terminate_instances', 'terminated'),
+}
+
+
+def _backoff(attempt, base=0.5, cap=20.0):
+    """Espera com backoff exponencial e jitter completo."""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def _tag_specifications(tags):
+    """Monta TagSpecifications para marcar instâncias e volumes na criação."""
+    tag_list = [{'Key': key, 'Value': str(value)} for key, value in tags.items()]
+    return [{'ResourceType': resource, 'Tags': tag_list} for resource in ('instance', 'volume')]
+
+
+def _split(total, parts):
+    """Divide total em len(parts) quantidades o mais iguais possível."""
+    return {part: total // len(parts) + (1 if i < total % len(parts) else 0)
+            for i, part in enumerate(parts)}
+
+
+def _chunks(items, size):
+    """Divide uma sequência em listas de até size elementos."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _tag(instance, key):
+    for tag in instance.get('Tags', ()):
+        if tag['Key'] == key:
+            return tag['Value']
+    return None
+
+
+# Campos disponíveis nos registros de instância:
+# nome -> função (instância retornada pela API, região) -> valor
+INSTANCE_FIELDS = {
+    'InstanceId': lambda i, region: i['InstanceId'],
+    'InstanceType': lambda i, region: i['InstanceType'],
+    'State': lambda i, region: i['State']['Name'],
+    'PublicIpAddress': lambda i, region: i.get('PublicIpAddress', 'N/A'),
+    'PrivateIpAddress': lambda i, region: i.get('PrivateIpAddress'),
+    'LaunchTime': lambda i, region: str(i['LaunchTime']),
+    'ImageId': lambda i, region: i.get('ImageId'),
+    'VpcId': lambda i, region: i.get('VpcId'),
+    'SubnetId': lambda i, region: i.get('SubnetId'),
+    'AvailabilityZone': lambda i, region: i.get('Placement', {}).get('AvailabilityZone'),
+    'Name': lambda i, region: _tag(i, 'Name'),
+    'Tags': lambda i, region: tuple((t['Key'], t['Value']) for t in i.get('Tags', ())),
+    'SecurityGroups': lambda i, region: tuple(g['GroupId'] for g in i.get('SecurityGroups', ())),
+    'Region': lambda i, region: region,
+}
+
+DEFAULT_INSTANCE_FIELDS = ('InstanceId', 'InstanceType', 'State', 'PublicIpAddress', 'LaunchTime')
+
+
+@lru_cache(maxsize=None)
+def instance_record_type(fields=DEFAULT_INSTANCE_FIELDS):
+    """
+    Retorna o tipo de registro (namedtuple, sem __dict__) para os campos pedidos.
+
+    Args:
+        fields (tuple): Nomes de campos de INSTANCE_FIELDS
+
+    Returns:
+        type: Subclasse de namedtuple 'InstanceRecord'
+    """
+    unknown = [f for f in fields if f not in INSTANCE_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)} "
+                         f"(opções: {', '.join(INSTANCE_FIELDS)})")
+    return namedtuple('InstanceRecord', fields)
+
+
+def _instance_details(instance):
+    """Converte uma instância retornada por describe_instances no dict de detalhes."""
+    return {
+        'InstanceId': instance['InstanceId'],
+        'InstanceType': instance['InstanceType'],
+        'State': instance['State']['Name'],
+        'PublicIpAddress': instance.get('PublicIpAddress'),
+        'PrivateIpAddress': instance.get('PrivateIpAddress'),
+        'LaunchTime': str(instance['LaunchTime']),
+        'SecurityGroups': instance.get('SecurityGroups', []),
+        'Tags': instance.get('Tags', [])
+    }
+
+
+def _filters(filters):
+    """Aceita filtros como lista da API ou dict {nome: valores}."""
+    if isinstance(filters, dict):
+        return [
+            {'Name': name, 'Values': [values] if isinstance(values, str) else list(values)}
+            for name, values in filters.items()
+        ]
+    return list(filters)
 
 
 class EC2Manager:
-    def __init__(self, region='us-east-1'):
+    ec2_client = LazyClient('ec2')
+    ec2_resource = LazyClient('ec2', resource=True)
+
+    def __init__(self, region='us-east-1', instance_cache=None):
         """
         Inicializa o gerenciador EC2.
         
         Args:
             region (str): Região AWS
+            instance_cache (InstanceCache): Cache de detalhes de instâncias
+                para get_instance_details/get_instances_details (opcional)
         """
-        self.ec2_client = boto3.client('ec2', region_name=region)
-        self.ec2_resource = boto3.resource('ec2', region_name=region)
+        self.region = region
+        self.instance_cache = instance_cache
 
     def create_instance(self, image_id, instance_type='t2.micro', 
                        key_name=None, security_groups=None, 
@@ -52,17 +182,15 @@ class EC2Manager:
             if user_data:
                 params['UserData'] = user_data
             
+            # Tag aplicada na criação, sem uma chamada extra de create_tags
+            if tag_name:
+                params['TagSpecifications'] = _tag_specifications({'Name': tag_name})
+            
             response = self.ec2_client.run_instances(**params)
             instance_id = response['Instances'][0]['InstanceId']
             
-            # Adicionar tag à instância
             if tag_name:
-                self.ec2_client.create_tags(
-                    Resources=[instance_id],
-                    Tags=[{'Key': 'Name', 'Value': tag_name}]
-                )
                 print(f"✓ Tag adicionada: {tag_name}")
-            
             print(f"✓ Instância criada: {instance_id}")
             return instance_id
             
@@ -70,63 +198,390 @@ class EC2Manager:
             print(f"✗ Erro ao criar instância: {e}")
             return None
 
-    def list_instances(self):
+    def _launch_in_subnet(self, params, subnet_id, count, max_per_call, max_retries):
         """
-        Lista todas as instâncias EC2.
+        Lança count instâncias em uma sub-rede, até max_per_call por chamada.
         
         Returns:
-            list: Lista de instâncias
+            tuple: (IDs lançados, mensagem de erro ou None)
         """
-        try:
-            response = self.ec2_client.describe_instances()
-            instances = []
+        launched = []
+        attempt = 0
+        while len(launched) < count:
+            client_token = uuid.uuid4().hex
+            call_params = dict(
+                params,
+                MinCount=1,
+                MaxCount=min(max_per_call, count - len(launched)),
+                # Token novo por tentativa: repetições internas do botocore
+                # reutilizam o mesmo e não duplicam instâncias
+                ClientToken=client_token
+            )
+            if subnet_id:
+                call_params['SubnetId'] = subnet_id
+            try:
+                response = self.ec2_client.run_instances(**call_params)
+            except ClientError as e:
+                if e.response['Error']['Code'] in LAUNCH_RETRY_ERRORS and attempt < max_retries:
+                    _backoff(attempt)
+                    attempt += 1
+                    continue
+                return launched, str(e)
+            except BotoCoreError as e:
+                # Timeout ou falha de conexão: a chamada pode ter lançado
+                # instâncias; o token permite encontrá-las (filtro client-token)
+                return launched, f"{e} (ClientToken {client_token})"
+            launched.extend(instance['InstanceId'] for instance in response['Instances'])
+            attempt = 0
+        return launched, None
+
+    def launch_fleet(self, image_id, count, instance_type='t2.micro', subnet_ids=None,
+                     key_name=None, security_group_ids=None, tags=None, user_data=None,
+                     max_per_call=100, max_workers=8, wait=True, poll_interval=5,
+                     timeout=600, max_retries=5):
+        """
+        Lança muitas instâncias com poucas chamadas de RunInstances.
+        
+        Cada chamada pede até max_per_call instâncias (MinCount=1, então
+        lançamentos parciais são aproveitados) já com as tags
+        (TagSpecifications). As instâncias são divididas entre as sub-redes,
+        lançadas em paralelo; falta de capacidade e throttling são repetidos
+        com backoff, e o que uma sub-rede não conseguir lançar é
+        redistribuído entre as demais.
+        
+        Args:
+            image_id (str): ID da AMI
+            count (int): Número de instâncias
+            instance_type (str): Tipo de instância
+            subnet_ids (list): Sub-redes (ex: uma por AZ); padrão: VPC default
+            key_name (str): Nome do par de chaves
+            security_group_ids (list): IDs dos grupos de segurança
+            tags (dict): Tags das instâncias e volumes
+            user_data (str): Script de inicialização
+            max_per_call (int): Máximo de instâncias por RunInstances
+            max_workers (int): Sub-redes lançadas em paralelo
+            wait (bool): Espera as instâncias ficarem 'running'
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas por chamada com erro recuperável
             
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    instances.append({
-                        'InstanceId': instance['InstanceId'],
-                        'InstanceType': instance['InstanceType'],
-                        'State': instance['State']['Name'],
-                        'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
-                        'LaunchTime': str(instance['LaunchTime'])
-                    })
+        Returns:
+            dict: Resumo com 'requested', 'launched' (IDs), 'by_subnet',
+                'errors' (sub-rede -> erro) e, com wait, 'states'
+        """
+        params = {'ImageId': image_id, 'InstanceType': instance_type}
+        if key_name:
+            params['KeyName'] = key_name
+        if security_group_ids:
+            params['SecurityGroupIds'] = list(security_group_ids)
+        if user_data:
+            params['UserData'] = user_data
+        if tags:
+            params['TagSpecifications'] = _tag_specifications(tags)
+        
+        subnets = list(subnet_ids or [None])
+        launched = {subnet: [] for subnet in subnets}
+        errors = {}
+        remaining = _split(count, subnets)
+        
+        while remaining:
+            jobs = {subnet: n for subnet, n in remaining.items() if n}
+            if not jobs:
+                break
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+                futures = {
+                    subnet: executor.submit(self._launch_in_subnet, params, subnet, n,
+                                            max_per_call, max_retries)
+                    for subnet, n in jobs.items()
+                }
+            shortfall = 0
+            for subnet, future in futures.items():
+                instance_ids, error = future.result()
+                launched[subnet].extend(instance_ids)
+                if error:
+                    errors[subnet or 'default'] = error
+                    shortfall += jobs[subnet] - len(instance_ids)
             
-            return instances
+            # Redistribui a falta entre as sub-redes que não falharam
+            healthy = [subnet for subnet in subnets if (subnet or 'default') not in errors]
+            remaining = _split(shortfall, healthy) if shortfall and healthy else None
+        
+        instance_ids = [i for ids in launched.values() for i in ids]
+        summary = {
+            'requested': count,
+            'launched': instance_ids,
+            'by_subnet': {subnet or 'default': len(ids) for subnet, ids in launched.items()},
+            'errors': errors
+        }
+        for subnet, error in errors.items():
+            print(f"✗ Erro ao lançar instâncias em {subnet}: {error}")
+        print(f"✓ {len(instance_ids)}/{count} instância(s) lançada(s)")
+        
+        if wait and instance_ids:
+            summary['states'] = self.wait_for_instance_states(
+                instance_ids, 'running', poll_interval, timeout, max_workers
+            )
+            ready = sum(1 for state in summary['states'].values() if state == 'running')
+            print(f"✓ {ready}/{len(instance_ids)} instância(s) running")
+        return summary
+
+    def list_instances(self, filters=None):
+        """
+        Lista todas as instâncias EC2.
+        
+        Args:
+            filters: Filtros do describe_instances, como lista da API ou
+                dict (ex: {'instance-state-name': ['running']})
+            
+        Returns:
+            list: Lista de instâncias
+        """
+        return [record._asdict() for record in self.iter_instances(filters)]
+
+    def _client_for(self, region):
+        if region is None or region == self.region:
+            return self.ec2_client
+        return get_client('ec2', region)
+
+    def iter_instances(self, filters=None, instance_ids=None, fields=DEFAULT_INSTANCE_FIELDS,
+                       page_size=1000, region=None):
+        """
+        Percorre as instâncias página a página, gerando registros compactos.
+        
+        Os filtros são aplicados no servidor e só uma página fica em memória
+        por vez. Cada instância vira uma namedtuple só com os campos pedidos.
+        
+        Args:
+            filters: Filtros do describe_instances (lista da API ou dict)
+            instance_ids (list): IDs específicos (opcional)
+            fields (tuple): Campos do registro (ver INSTANCE_FIELDS)
+            page_size (int): Instâncias por página (5 a 1000)
+            region (str): Região (padrão: a do gerenciador)
             
+        Yields:
+            InstanceRecord: Registro com os campos pedidos
+        """
+        region = region or self.region
+        try:
+            yield from self._iter_instance_records(filters, instance_ids, fields, page_size,
+                                                   region)
         except ClientError as e:
-            print(f"✗ Erro ao listar instâncias: {e}")
+            print(f"✗ Erro ao listar instâncias em {region}: {e}")
+
+    def _iter_instance_records(self, filters, instance_ids, fields, page_size, region):
+        """Como iter_instances, mas propaga os erros da API."""
+        record_type = instance_record_type(tuple(fields))
+        extractors = [INSTANCE_FIELDS[field] for field in record_type._fields]
+        
+        params = {}
+        if filters:
+            params['Filters'] = _filters(filters)
+        if instance_ids:
+            params['InstanceIds'] = list(instance_ids)
+        else:
+            # MaxResults não pode ser combinado com InstanceIds
+            params['PaginationConfig'] = {'PageSize': page_size}
+        
+        for instance in self._iter_raw_instances(params, region):
+            yield record_type._make(f(instance, region) for f in extractors)
+
+    def _iter_raw_instances(self, params, region=None):
+        """Pagina describe_instances gerando as instâncias como a API retorna."""
+        paginator = self._client_for(region).get_paginator('describe_instances')
+        for page in paginator.paginate(**params):
+            for reservation in page['Reservations']:
+                yield from reservation['Instances']
+
+    def list_regions(self):
+        """
+        Lista as regiões habilitadas na conta.
+        
+        Returns:
+            list: Nomes das regiões
+        """
+        try:
+            return self._region_names()
+        except ClientError as e:
+            print(f"✗ Erro ao listar regiões: {e}")
             return []
 
+    def _region_names(self):
+        response = self.ec2_client.describe_regions()
+        return [region['RegionName'] for region in response['Regions']]
+
+    def iter_instances_all_regions(self, regions=None, filters=None,
+                                   fields=DEFAULT_INSTANCE_FIELDS, max_workers=8,
+                                   max_buffered=1000):
+        """
+        Percorre as instâncias de várias regiões ao mesmo tempo.
+        
+        Cada região é paginada em sua própria thread e os registros chegam
+        por uma fila limitada, então a memória fica constante. Um erro da
+        API em qualquer região (ou ao listar as regiões) é propagado ao
+        consumidor, em vez de encurtar o inventário.
+        
+        Args:
+            regions (list): Regiões (padrão: todas as habilitadas)
+            filters: Filtros do describe_instances (lista da API ou dict)
+            fields (tuple): Campos do registro; 'Region' é sempre incluído
+            max_workers (int): Regiões consultadas em paralelo
+            max_buffered (int): Máximo de registros aguardando o consumidor
+            
+        Yields:
+            InstanceRecord: Registros, sem ordem garantida entre regiões
+        """
+        fields = tuple(fields)
+        if 'Region' not in fields:
+            fields += ('Region',)
+        producers = [
+            lambda region=region: self._iter_instance_records(filters, None, fields, 1000, region)
+            for region in (regions or self._region_names())
+        ]
+        yield from iter_parallel(producers, max_workers, max_buffered)
+
     def get_instance_details(self, instance_id):
         """
         Obtém detalhes de uma instância.
         
+        Com instance_cache, a consulta é servida da memória enquanto válida.
+        
         Args:
             instance_id (str): ID da instância
             
         Returns:
             dict: Detalhes da instância
         """
+        details = self.get_instances_details([instance_id]).get(instance_id)
+        if details is None:
+            print(f"✗ Instância não encontrada: {instance_id}")
+        return details
+
+    def _describe_details(self, instance_ids):
+        """Busca os detalhes de até 200 instâncias em uma consulta paginada."""
+        params = {'Filters': [{'Name': 'instance-id', 'Values': instance_ids}]}
+        return {
+            instance['InstanceId']: _instance_details(instance)
+            for instance in self._iter_raw_instances(params)
+        }
+
+    def get_instances_details(self, instance_ids, max_workers=4):
+        """
+        Obtém detalhes de muitas instâncias com poucas chamadas.
+        
+        As instâncias em cache são servidas da memória; as demais são
+        buscadas com describe_instances filtrando por instance-id (até 200
+        IDs por chamada, lotes em paralelo). IDs inexistentes são omitidos.
+        
+        Args:
+            instance_ids (iterable): IDs das instâncias
+            max_workers (int): Lotes consultados em paralelo
+            
+        Returns:
+            dict: ID -> detalhes, para as instâncias encontradas
+        """
+        instance_ids = list(dict.fromkeys(instance_ids))
+        found = {}
+        missing = []
+        for instance_id in instance_ids:
+            details = self.instance_cache.get(instance_id) if self.instance_cache else None
+            if details is None:
+                missing.append(instance_id)
+            else:
+                found[instance_id] = details
+        
+        chunks = _chunks(missing, DESCRIBE_BATCH_SIZE)
+        if chunks:
+            try:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                    for fetched in executor.map(self._describe_details, chunks):
+                        found.update(fetched)
+                        if self.instance_cache:
+                            for instance_id, details in fetched.items():
+                                self.instance_cache.put(instance_id, details)
+            except ClientError as e:
+                print(f"✗ Erro ao obter detalhes: {e}")
+        return {instance_id: found[instance_id] for instance_id in instance_ids
+                if instance_id in found}
+
+    def refresh_instance_cache(self, max_workers=4):
+        """
+        Renova o cache de instâncias de forma incremental.
+        
+        O estado das instâncias em cache (e só delas) é consultado com
+        describe_instance_status, 100 IDs por chamada, incluindo as paradas
+        (IncludeAllInstances), e comparado com o cache: instâncias com
+        estado inalterado e ainda válidas têm a validade renovada, as que
+        mudaram ou expiraram têm os detalhes buscados de novo em lote (assim
+        IP público, tags e grupos são relidos pelo menos a cada TTL) e as que
+        não existem mais saem do cache.
+        
+        Args:
+            max_workers (int): Lotes consultados em paralelo
+            
+        Returns:
+            dict: Resumo com 'checked', 'changed', 'expired' e 'removed', ou
+                None em erro
+        """
+        if not self.instance_cache:
+            return None
+        cached = self.instance_cache.states()
+        current = {}
+        chunks = _chunks(list(cached), INSTANCE_BATCH_SIZE)
         try:
-            instance = self.ec2_resource.Instance(instance_id)
-            return {
-                'InstanceId': instance.id,
-                'InstanceType': instance.instance_type,
-                'State': instance.state['Name'],
-                'PublicIpAddress': instance.public_ip_address,
-                'PrivateIpAddress': instance.private_ip_address,
-                'LaunchTime': str(instance.launch_time),
-                'SecurityGroups': instance.security_groups,
-                'Tags': instance.tags or []
-            }
+            if chunks:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                    for states in executor.map(self._instance_states, chunks):
+                        current.update(states)
         except ClientError as e:
-            print(f"✗ Erro ao obter detalhes: {e}")
+            print(f"✗ Erro ao renovar cache de instâncias: {e}")
             return None
+        
+        changed = []
+        expired = []
+        removed = 0
+        for instance_id, state in cached.items():
+            if instance_id not in current:
+                self.instance_cache.invalidate(instance_id)
+                removed += 1
+            elif current[instance_id] != state:
+                self.instance_cache.invalidate(instance_id)
+                changed.append(instance_id)
+            elif not self.instance_cache.touch(instance_id):
+                expired.append(instance_id)
+        if changed or expired:
+            self.get_instances_details(changed + expired, max_workers)
+        return {'checked': len(cached), 'changed': len(changed), 'expired': len(expired),
+                'removed': removed}
+
+    def start_cache_refresh(self, interval=30):
+        """
+        Renova o cache periodicamente em uma thread de fundo.
+        
+        Args:
+            interval (float): Segundos entre renovações
+            
+        Returns:
+            threading.Event: Evento que para a renovação quando acionado
+        """
+        stop = threading.Event()
+        
+        def loop():
+            while not stop.wait(interval):
+                self.refresh_instance_cache()
+        
+        threading.Thread(target=loop, name='ec2-instance-cache', daemon=True).start()
+        return stop
+
+    def _invalidate_instances(self, instance_ids):
+        if self.instance_cache:
+            for instance_id in instance_ids:
+                self.instance_cache.invalidate(instance_id)
 
     def start_instance(self, instance_id):
         """Inicia uma instância parada."""
         try:
             self.ec2_client.start_instances(InstanceIds=[instance_id])
+            self._invalidate_instances([instance_id])
             print(f"✓ Instância iniciada: {instance_id}")
         except ClientError as e:
             print(f"✗ Erro ao iniciar instância: {e}")
@@ -135,6 +590,7 @@ class EC2Manager:
         """Para uma instância em execução."""
         try:
             self.ec2_client.stop_instances(InstanceIds=[instance_id])
+            self._invalidate_instances([instance_id])
             print(f"✓ Instância parada: {instance_id}")
         except ClientError as e:
             print(f"✗ Erro ao parar instância: {e}")
@@ -143,10 +599,214 @@ class EC2Manager:
         """Encerra uma instância."""
         try:
             self.ec2_client.terminate_instances(InstanceIds=[instance_id])
+            self._invalidate_instances([instance_id])
             print(f"✓ Instância encerrada: {instance_id}")
         except ClientError as e:
             print(f"✗ Erro ao encerrar instância: {e}")
 
+    def _run_instance_action(self, method, instance_ids, max_retries, params):
+        """
+        Executa uma ação em um lote de IDs.
+        
+        Throttling é repetido com backoff. Outros erros (ex: um ID
+        inexistente) dividem o lote ao meio até isolar os IDs com problema,
+        para que o restante do lote não falhe junto.
+        
+        Returns:
+            dict: ID -> mensagem de erro, para os IDs que falharam
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                getattr(self.ec2_client, method)(InstanceIds=instance_ids, **params)
+                return {}
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code in THROTTLING_ERRORS and attempt < max_retries:
+                    _backoff(attempt)
+                    continue
+                if code in THROTTLING_ERRORS or len(instance_ids) == 1:
+                    return {instance_id: str(e) for instance_id in instance_ids}
+                middle = len(instance_ids) // 2
+                failed = self._run_instance_action(method, instance_ids[:middle],
+                                                   max_retries, params)
+                failed.update(self._run_instance_action(method, instance_ids[middle:],
+                                                        max_retries, params))
+                return failed
+
+    def _bulk_instance_action(self, action, instance_ids, wait, max_workers, poll_interval,
+                              timeout, max_retries, **params):
+        """Aplica uma ação de INSTANCE_ACTIONS a muitas instâncias em paralelo."""
+        method, target_state = INSTANCE_ACTIONS[action]
+        instance_ids = list(dict.fromkeys(instance_ids))
+        chunks = _chunks(instance_ids, INSTANCE_BATCH_SIZE)
+        failed = {}
+        
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                futures = [executor.submit(self._run_instance_action, method, chunk,
+                                           max_retries, params)
+                           for chunk in chunks]
+                for future in futures:
+                    failed.update(future.result())
+        
+        succeeded = [i for i in instance_ids if i not in failed]
+        self._invalidate_instances(succeeded)
+        summary = {'requested': len(instance_ids), 'succeeded': succeeded, 'failed': failed}
+        for instance_id, error in failed.items():
+            print(f"✗ Erro ao aplicar '{action}' em {instance_id}: {error}")
+        
+        if wait and succeeded:
+            summary['states'] = self.wait_for_instance_states(
+                succeeded, target_state, poll_interval, timeout, max_workers
+            )
+            ready = sum(1 for state in summary['states'].values() if state == target_state)
+            print(f"✓ {ready}/{len(instance_ids)} instância(s) {target_state}")
+        else:
+            print(f"✓ '{action}' aplicado a {len(succeeded)}/{len(instance_ids)} instância(s)")
+        return summary
+
+    def start_instances(self, instance_ids, wait=False, max_workers=8, poll_interval=5,
+                        timeout=600, max_retries=8):
+        """
+        Inicia muitas instâncias em lotes paralelos de até 100 IDs.
+        
+        Args:
+            instance_ids (iterable): IDs das instâncias
+            wait (bool): Espera as instâncias ficarem 'running'
+            max_workers (int): Lotes simultâneos
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas por lote em caso de throttling
+            
+        Returns:
+            dict: Resumo com 'requested', 'succeeded' (IDs), 'failed'
+                (ID -> erro) e, com wait, 'states' (ID -> estado final)
+        """
+        return self._bulk_instance_action('start', instance_ids, wait, max_workers,
+                                          poll_interval, timeout, max_retries)
+
+    def stop_instances(self, instance_ids, wait=False, force=False, max_workers=8,
+                       poll_interval=5, timeout=600, max_retries=8):
+        """
+        Para muitas instâncias em lotes paralelos de até 100 IDs.
+        
+        Args:
+            instance_ids (iterable): IDs das instâncias
+            wait (bool): Espera as instâncias ficarem 'stopped'
+            force (bool): Força a parada (sem desligamento do sistema operacional)
+            max_workers (int): Lotes simultâneos
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas por lote em caso de throttling
+            
+        Returns:
+            dict: Resumo como em start_instances
+        """
+        params = {'Force': True} if force else {}
+        return self._bulk_instance_action('stop', instance_ids, wait, max_workers,
+                                          poll_interval, timeout, max_retries, **params)
+
+    def terminate_instances(self, instance_ids, wait=False, max_workers=8, poll_interval=5,
+                            timeout=600, max_retries=8):
+        """
+        Encerra muitas instâncias em lotes paralelos de até 100 IDs.
+        
+        Args:
+            instance_ids (iterable): IDs das instâncias
+            wait (bool): Espera as instâncias ficarem 'terminated'
+            max_workers (int): Lotes simultâneos
+            poll_interval (float): Segundos entre consultas de estado
+            timeout (float): Segundos máximos de espera
+            max_retries (int): Tentativas por lote em caso de throttling
+            
+        Returns:
+            dict: Resumo como em start_instances
+        """
+        return self._bulk_instance_action('terminate', instance_ids, wait, max_workers,
+                                          poll_interval, timeout, max_retries)
+
+    def _instance_states(self, instance_ids, max_retries=8):
+        """
+        Consulta o estado de até 100 instâncias com describe_instance_status.
+        
+        Um ID ainda não visível (InvalidInstanceID.NotFound) faz o lote ser
+        dividido ao meio, para que só ele fique sem estado nesta rodada.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.ec2_client.describe_instance_status(
+                    InstanceIds=instance_ids, IncludeAllInstances=True
+                )
+                return {
+                    status['InstanceId']: status['InstanceState']['Name']
+                    for status in response['InstanceStatuses']
+                }
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code == 'InvalidInstanceID.NotFound':
+                    # Instâncias recém-criadas podem ainda não estar visíveis
+                    if len(instance_ids) == 1:
+                        return {}
+                    middle = len(instance_ids) // 2
+                    states = self._instance_states(instance_ids[:middle], max_retries)
+                    states.update(self._instance_states(instance_ids[middle:], max_retries))
+                    return states
+                if code not in THROTTLING_ERRORS or attempt == max_retries:
+                    raise
+                _backoff(attempt)
+
+    def wait_for_instance_states(self, instance_ids, state, poll_interval=5, timeout=600,
+                                 max_workers=8):
+        """
+        Espera muitas instâncias chegarem a um estado.
+        
+        Em vez de um waiter por instância, cada rodada consulta todas as
+        pendentes com describe_instance_status (100 IDs por chamada, lotes
+        em paralelo).
+        
+        Args:
+            instance_ids (iterable): IDs das instâncias
+            state (str): Estado esperado (ex: 'running', 'stopped', 'terminated')
+            poll_interval (float): Segundos entre rodadas de consulta
+            timeout (float): Segundos máximos de espera
+            max_workers (int): Lotes consultados em paralelo
+            
+        Returns:
+            dict: ID -> estado esperado, ou 'TIMEOUT' se não chegou a ele
+        """
+        requested = list(dict.fromkeys(instance_ids))
+        pending = requested
+        states = {}
+        deadline = time.monotonic() + timeout
+        if not pending:
+            return states
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                current = {}
+                try:
+                    for result in executor.map(self._instance_states,
+                                               _chunks(pending, INSTANCE_BATCH_SIZE)):
+                        current.update(result)
+                except ClientError as e:
+                    print(f"✗ Erro ao consultar estado das instâncias: {e}")
+                
+                still_pending = []
+                for instance_id in pending:
+                    # Instâncias encerradas há algum tempo deixam de ser retornadas
+                    found = current.get(instance_id, 'terminated' if state == 'terminated' else None)
+                    if found == state:
+                        states[instance_id] = state
+                    else:
+                        still_pending.append(instance_id)
+                pending = still_pending
+                if pending and time.monotonic() + poll_interval > deadline:
+                    states.update({instance_id: 'TIMEOUT' for instance_id in pending})
+                    break
+                if pending:
+                    time.sleep(poll_interval)
+        return {instance_id: states[instance_id] for instance_id in requested}
+
     def allocate_elastic_ip(self):
         """
         Aloca um Elastic IP.
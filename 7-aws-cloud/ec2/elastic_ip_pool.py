@@ -0,0 +1,296 @@
+"""
+Pool de Elastic IPs reutilizáveis.
+
+Os endereços do pool são identificados por uma tag (eip-pool=<nome>). Uma
+única chamada de describe_addresses mostra quais estão livres; o pool
+mantém uma reserva pré-alocada ("warm pool") e associa muitos pares
+instância/endereço em paralelo. As operações conferem o estado atual
+antes de agir, então podem ser repetidas com segurança após uma falha.
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
+POOL_TAG_KEY = 'eip-pool'
+
+# Erros de throttling da API do EC2 que justificam nova tentativa
+THROTTLING_ERRORS = ('RequestLimitExceeded', 'Throttling', 'ThrottlingException')
+
+# Endereço já associado (ex: escolhido ao mesmo tempo por outro processo)
+ALREADY_ASSOCIATED = 'Resource.AlreadyAssociated'
+
+# Rodadas de assign() para trocar endereços tomados por outro processo
+MAX_ASSIGN_ROUNDS = 3
+
+
+def _backoff(attempt, base=0.5, cap=20.0):
+    """Espera com backoff exponencial e jitter completo."""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+class ElasticIPPool:
+    ec2_client = LazyClient('ec2')
+
+    def __init__(self, region='us-east-1', pool_name='default', max_workers=16, max_retries=8):
+        """
+        Inicializa o pool de Elastic IPs.
+
+        Args:
+            region (str): Região AWS
+            pool_name (str): Valor da tag eip-pool que identifica o pool
+            max_workers (int): Chamadas simultâneas
+            max_retries (int): Tentativas por chamada em caso de throttling
+        """
+        self.region = region
+        self.pool_name = pool_name
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        # Endereços livres já entregues por acquire() e ainda não associados
+        self._reserved = set()
+        self._lock = threading.Lock()
+
+    def _call(self, method, **params):
+        """Chama a API repetindo em caso de throttling."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return getattr(self.ec2_client, method)(**params)
+            except ClientError as e:
+                if e.response['Error']['Code'] not in THROTTLING_ERRORS or attempt == self.max_retries:
+                    raise
+                _backoff(attempt)
+
+    def _map(self, function, items):
+        """Aplica function a cada item em paralelo, preservando a ordem."""
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    def describe(self):
+        """
+        Lista os endereços do pool com uma única chamada.
+
+        Returns:
+            list: Endereços de describe_addresses
+        """
+        try:
+            response = self._call('describe_addresses', Filters=[
+                {'Name': f'tag:{POOL_TAG_KEY}', 'Values': [self.pool_name]}
+            ])
+            return response['Addresses']
+        except (ClientError, BotoCoreError) as e:
+            print(f"✗ Erro ao listar Elastic IPs: {e}")
+            return []
+
+    def free_addresses(self, addresses=None):
+        """
+        Retorna os endereços do pool sem associação.
+
+        Args:
+            addresses (list): Resultado de describe() já obtido (opcional)
+
+        Returns:
+            list: Endereços livres
+        """
+        if addresses is None:
+            addresses = self.describe()
+        return [a for a in addresses if 'AssociationId' not in a]
+
+    def _allocate(self, _):
+        try:
+            return self._call('allocate_address', Domain='vpc', TagSpecifications=[{
+                'ResourceType': 'elastic-ip',
+                'Tags': [{'Key': POOL_TAG_KEY, 'Value': self.pool_name}]
+            }])
+        except (ClientError, BotoCoreError) as e:
+            print(f"✗ Erro ao alocar Elastic IP: {e}")
+            return None
+
+    def warm(self, size):
+        """
+        Garante pelo menos size endereços livres no pool.
+
+        Só aloca a diferença entre size e os livres atuais (alocações em
+        paralelo), então repetir a chamada não aloca endereços a mais.
+
+        Args:
+            size (int): Quantidade mínima de endereços livres
+
+        Returns:
+            list: Endereços livres após o aquecimento
+        """
+        free = self.free_addresses()
+        missing = size - len(free)
+        if missing > 0:
+            allocated = [a for a in self._map(self._allocate, range(missing)) if a]
+            free.extend(allocated)
+            print(f"✓ {len(allocated)} Elastic IP(s) alocado(s) no pool {self.pool_name}")
+        return free
+
+    def acquire(self, count, addresses=None):
+        """
+        Reserva endereços livres, alocando novos se faltar.
+
+        Um endereço reservado não é entregue de novo por este objeto até
+        ser associado (associate_many) ou devolvido (release_reservations).
+
+        Args:
+            count (int): Quantidade de endereços
+            addresses (list): Resultado de describe() já obtido (opcional)
+
+        Returns:
+            list: AllocationIds reservados (pode ter menos que count se a
+                alocação falhar, ex: limite da conta)
+        """
+        free = self.free_addresses(addresses)
+        with self._lock:
+            chosen = [a['AllocationId'] for a in free
+                      if a['AllocationId'] not in self._reserved][:count]
+            self._reserved.update(chosen)
+        missing = count - len(chosen)
+        if missing > 0:
+            allocated = [a['AllocationId'] for a in self._map(self._allocate, range(missing)) if a]
+            with self._lock:
+                self._reserved.update(allocated)
+            chosen.extend(allocated)
+        return chosen
+
+    def release_reservations(self, allocation_ids):
+        """Devolve ao pool endereços reservados e não usados."""
+        with self._lock:
+            self._reserved.difference_update(allocation_ids)
+
+    def _associate(self, pair, current, allow_reassociation):
+        instance_id, allocation_id = pair
+        if current.get(allocation_id) == instance_id:
+            return 'unchanged'
+        try:
+            # AllowReassociation move o endereço mesmo se já estiver em uso
+            # (troca blue/green); sem ele, um endereço que outro processo
+            # acabou de associar não é tomado da instância dele
+            self._call('associate_address', AllocationId=allocation_id,
+                       InstanceId=instance_id, AllowReassociation=allow_reassociation)
+            return 'associated'
+        except (ClientError, BotoCoreError) as e:
+            # Erros de conexão também devolvem o endereço à reserva (finally)
+            if (isinstance(e, ClientError) and not allow_reassociation
+                    and e.response['Error']['Code'] == ALREADY_ASSOCIATED):
+                return 'conflict'
+            print(f"✗ Erro ao associar {allocation_id} a {instance_id}: {e}")
+            return 'failed'
+        finally:
+            self.release_reservations([allocation_id])
+
+    def associate_many(self, pairs, addresses=None, allow_reassociation=False):
+        """
+        Associa muitos pares instância/endereço em paralelo.
+
+        Pares que já estão associados como pedido não geram chamadas.
+
+        Args:
+            pairs (dict): ID da instância -> AllocationId
+            addresses (list): Resultado de describe() já obtido (opcional)
+            allow_reassociation (bool): Move endereços já associados a outra
+                instância (remapeamento explícito, ex: troca blue/green)
+
+        Returns:
+            dict: ID da instância -> 'associated', 'unchanged', 'failed' ou
+                'conflict' (endereço já associado a outra instância, sem
+                allow_reassociation)
+        """
+        if addresses is None:
+            addresses = self.describe()
+        current = {a['AllocationId']: a.get('InstanceId') for a in addresses}
+        items = list(pairs.items())
+        results = self._map(
+            lambda pair: self._associate(pair, current, allow_reassociation), items
+        )
+        statuses = dict(zip((instance_id for instance_id, _ in items), results))
+        changed = sum(1 for status in results if status == 'associated')
+        print(f"✓ {changed} associação(ões) feita(s), "
+              f"{len(items) - changed} sem alteração ou com falha")
+        return statuses
+
+    def assign(self, instance_ids):
+        """
+        Garante um Elastic IP do pool para cada instância.
+
+        Instâncias que já têm um endereço do pool ficam com ele; as demais
+        recebem endereços livres (ou recém-alocados). Tudo parte de uma
+        única chamada de describe_addresses. Endereços livres nunca são
+        tomados de outra instância: se outro processo associou o mesmo
+        endereço antes, a lista é relida e outro endereço é escolhido.
+
+        Args:
+            instance_ids (iterable): IDs das instâncias
+
+        Returns:
+            dict: ID da instância -> IP público (None se falhou)
+        """
+        addresses = self.describe()
+        by_instance = {a['InstanceId']: a for a in addresses if a.get('InstanceId')}
+        instance_ids = list(dict.fromkeys(instance_ids))
+        pending = [i for i in instance_ids if i not in by_instance]
+
+        pairs = {}
+        statuses = {}
+        for _ in range(MAX_ASSIGN_ROUNDS):
+            allocation_ids = self.acquire(len(pending), addresses)
+            round_pairs = dict(zip(pending, allocation_ids))
+            round_statuses = self.associate_many(round_pairs, addresses)
+            pairs.update(round_pairs)
+            statuses.update(round_statuses)
+            pending = [i for i, status in round_statuses.items() if status == 'conflict']
+            if not pending:
+                break
+            addresses = self.describe()
+
+        public_ips = {a['AllocationId']: a['PublicIp'] for a in addresses}
+        if any(allocation_id not in public_ips for allocation_id in pairs.values()):
+            # Endereços recém-alocados não estavam no describe inicial
+            public_ips.update({a['AllocationId']: a['PublicIp'] for a in self.describe()})
+
+        result = {}
+        for instance_id in instance_ids:
+            if instance_id in by_instance:
+                result[instance_id] = by_instance[instance_id]['PublicIp']
+            elif statuses.get(instance_id) in ('associated', 'unchanged'):
+                result[instance_id] = public_ips.get(pairs[instance_id])
+            else:
+                result[instance_id] = None
+        return result
+
+    def release_free(self, keep=0):
+        """
+        Libera endereços livres do pool além dos keep primeiros.
+
+        Args:
+            keep (int): Endereços livres a manter como reserva
+
+        Returns:
+            int: Quantidade de endereços liberados
+        """
+        free = self.free_addresses()
+        with self._lock:
+            free = [a['AllocationId'] for a in free if a['AllocationId'] not in self._reserved]
+
+        def release(allocation_id):
+            try:
+                self._call('release_address', AllocationId=allocation_id)
+                return True
+            except (ClientError, BotoCoreError) as e:
+                print(f"✗ Erro ao liberar {allocation_id}: {e}")
+                return False
+
+        released = sum(self._map(release, free[keep:]))
+        print(f"✓ {released} Elastic IP(s) liberado(s) do pool {self.pool_name}")
+        return released
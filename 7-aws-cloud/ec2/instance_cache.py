@@ -0,0 +1,123 @@
+"""
+Cache em processo de detalhes de instâncias EC2 para o EC2Manager.
+
+Mantém os detalhes por ID com despejo LRU e expiração por TTL. O
+EC2Manager renova as entradas de forma incremental: consulta só o estado
+das instâncias em cache e busca de novo os detalhes das que mudaram ou
+expiraram.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+class InstanceCache:
+    def __init__(self, ttl=60, max_items=100000):
+        """
+        Inicializa o cache de instâncias.
+
+        Args:
+            ttl (float): Segundos de validade dos detalhes de uma instância
+            max_items (int): Máximo de instâncias mantidas
+        """
+        self.ttl = ttl
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, instance_id):
+        """
+        Obtém os detalhes de uma instância, se ainda válidos.
+
+        Args:
+            instance_id (str): ID da instância
+
+        Returns:
+            dict: Detalhes da instância, ou None se ausente ou expirado
+        """
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            if entry is None or time.monotonic() >= entry[1]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(instance_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, instance_id, details):
+        """
+        Grava os detalhes de uma instância.
+
+        Args:
+            instance_id (str): ID da instância
+            details (dict): Detalhes (com a chave 'State')
+        """
+        with self._lock:
+            self._entries.pop(instance_id, None)
+            self._entries[instance_id] = (details, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def touch(self, instance_id):
+        """
+        Renova a validade de uma instância cujo estado não mudou.
+
+        Só entradas ainda válidas são renovadas: uma entrada expirada precisa
+        ter os detalhes buscados de novo (IP público, tags e grupos podem
+        mudar sem mudança de estado).
+
+        Args:
+            instance_id (str): ID da instância
+
+        Returns:
+            bool: True se renovada, False se ausente ou expirada
+        """
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            now = time.monotonic()
+            if entry is None or now >= entry[1]:
+                return False
+            self._entries[instance_id] = (entry[0], now + self.ttl)
+            return True
+
+    def states(self):
+        """
+        Retorna o último estado conhecido de cada instância, mesmo expirada.
+
+        Returns:
+            dict: ID -> estado
+        """
+        with self._lock:
+            return {instance_id: entry[0]['State'] for instance_id, entry in self._entries.items()}
+
+    def invalidate(self, instance_id):
+        """Remove uma instância do cache."""
+        with self._lock:
+            self._entries.pop(instance_id, None)
+
+    def clear(self):
+        """Esvazia o cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Acertos, faltas, despejos e entradas
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'entries': len(self._entries)
+            }
@@ -2,14 +2,69 @@
 Script para gerenciar Security Groups em EC2.
 """
 
-import boto3
+import os
+import sys
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+from sg_rules import (SOURCE_FIELDS, merge_rules, rules_from_permissions, rules_from_spec,
+                      to_permissions)
+from sg_index import SecurityGroupIndex
+
+# Máximo de GroupIds por chamada de describe_security_groups
+DESCRIBE_BATCH_SIZE = 200
+
+# Erros de throttling da API do EC2 que justificam nova tentativa
+THROTTLING_ERRORS = ('RequestLimitExceeded', 'Throttling', 'ThrottlingException')
+
+# Direção -> (campo em describe_security_groups, authorize, revoke,
+# atualização de descrições)
+DIRECTIONS = {
+    'ingress': ('IpPermissions', 'authorize_security_group_ingress',
+                'revoke_security_group_ingress',
+                'update_security_group_rule_descriptions_ingress'),
+    'egress': ('IpPermissionsEgress', 'authorize_security_group_egress',
+               'revoke_security_group_egress',
+               'update_security_group_rule_descriptions_egress'),
+}
+
+
+# Listas de origens dentro de uma IpPermission
+_SOURCE_LISTS = tuple(list_name for list_name, _ in SOURCE_FIELDS.values())
+
+
+def _backoff(attempt, base=0.5, cap=20.0):
+    """Espera com backoff exponencial e jitter completo."""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def _single(permissions):
+    """Indica se o lote tem uma única origem (não pode ser dividido)."""
+    sources = sum(len(p.get(name, [])) for p in permissions for name in _SOURCE_LISTS)
+    return sources <= 1
+
+
+def _split_permissions(permissions):
+    """Divide um lote de IpPermissions em lotes de uma origem cada."""
+    batches = []
+    for permission in permissions:
+        base = {k: v for k, v in permission.items() if not isinstance(v, list)}
+        for name in _SOURCE_LISTS:
+            for entry in permission.get(name, []):
+                batches.append([dict(base, **{name: [entry]})])
+    return batches
+
 
 class SecurityGroupManager:
+    ec2_client = LazyClient('ec2')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador de Security Groups."""
-        self.ec2_client = boto3.client('ec2', region_name=region)
+        self.region = region
 
     def create_security_group(self, group_name, description, vpc_id=None):
         """
@@ -116,12 +171,272 @@ class SecurityGroupManager:
 
     def describe_security_groups(self):
         """Lista todos os Security Groups."""
+        return list(self.iter_security_groups())
+
+    def iter_security_groups(self, filters=None, page_size=1000):
+        """
+        Percorre os Security Groups página a página.
+        
+        Args:
+            filters (list): Filtros da API (opcional)
+            page_size (int): Grupos por página (5 a 1000)
+            
+        Yields:
+            dict: Grupos como retornados pela API
+        """
         try:
-            response = self.ec2_client.describe_security_groups()
-            return response['SecurityGroups']
+            yield from self._paginate_groups(filters, page_size)
         except ClientError as e:
             print(f"✗ Erro ao listar Security Groups: {e}")
-            return []
+
+    def _paginate_groups(self, filters=None, page_size=1000):
+        """Como iter_security_groups, mas propaga ClientError."""
+        params = {'PaginationConfig': {'PageSize': page_size}}
+        if filters:
+            params['Filters'] = filters
+        paginator = self.ec2_client.get_paginator('describe_security_groups')
+        for page in paginator.paginate(**params):
+            yield from page['SecurityGroups']
+
+    def build_rule_index(self, filters=None):
+        """
+        Cria um índice de regras para consultas de alcance.
+        
+        Exemplo:
+            index = manager.build_rule_index()
+            index.allowed_groups('tcp', 5432, '10.2.3.4')
+        
+        Args:
+            filters (list): Filtros da API para limitar os grupos (opcional)
+            
+        Returns:
+            SecurityGroupIndex: Índice com os grupos de uma varredura paginada
+        """
+        index = SecurityGroupIndex(self.iter_security_groups(filters))
+        stats = index.stats()
+        print(f"✓ Índice criado: {stats['groups']} grupo(s), {stats['rules']} regra(s)")
+        return index
+
+    def refresh_rule_index(self, index, group_ids=None):
+        """
+        Atualiza um índice de regras, reindexando só os grupos alterados.
+        
+        Os grupos que não existem mais são removidos do índice. Se a
+        listagem falhar no meio, o índice fica como estava.
+        
+        Args:
+            index (SecurityGroupIndex): Índice a atualizar
+            group_ids (list): Grupos a reler (ex: após reconcile); sem eles,
+                todos são relidos
+            
+        Returns:
+            dict: Resumo com 'changed' e 'removed', ou None se a listagem falhou
+        """
+        try:
+            if group_ids is None:
+                groups = list(self._paginate_groups())
+            else:
+                group_ids = list(group_ids)
+                found = self._describe_groups_by_id(group_ids)
+        except ClientError as e:
+            print(f"✗ Erro ao atualizar o índice (mantido sem alterações): {e}")
+            return None
+        
+        if group_ids is None:
+            return index.update_groups(groups, complete=True)
+        summary = index.update_groups(found.values())
+        summary['removed'] = index.remove_groups(g for g in group_ids if g not in found)
+        return summary
+
+    def describe_groups_by_id(self, group_ids):
+        """
+        Obtém vários Security Groups por ID, em lotes paginados.
+        
+        Args:
+            group_ids (iterable): IDs dos grupos
+            
+        Returns:
+            dict: ID -> grupo (como retornado pela API)
+        """
+        try:
+            return self._describe_groups_by_id(group_ids)
+        except ClientError as e:
+            print(f"✗ Erro ao listar Security Groups: {e}")
+            return {}
+
+    def _describe_groups_by_id(self, group_ids):
+        """Como describe_groups_by_id, mas propaga ClientError."""
+        group_ids = list(dict.fromkeys(group_ids))
+        groups = {}
+        paginator = self.ec2_client.get_paginator('describe_security_groups')
+        for start in range(0, len(group_ids), DESCRIBE_BATCH_SIZE):
+            chunk = group_ids[start:start + DESCRIBE_BATCH_SIZE]
+            for page in paginator.paginate(Filters=[{'Name': 'group-id', 'Values': chunk}]):
+                groups.update((group['GroupId'], group) for group in page['SecurityGroups'])
+        return groups
+
+    def _apply_permissions(self, method, group_id, batches, ignored_error, max_retries):
+        """
+        Envia lotes de IpPermissions, repetindo throttling com backoff.
+        
+        Se um lote falha porque parte das regras já foi aplicada (ex:
+        regra duplicada após uma repetição), suas regras são reenviadas
+        uma a uma, ignorando ignored_error.
+        
+        Returns:
+            int: Número de chamadas que falharam
+        """
+        failures = 0
+        for permissions in batches:
+            for attempt in range(max_retries + 1):
+                try:
+                    getattr(self.ec2_client, method)(GroupId=group_id, IpPermissions=permissions)
+                    break
+                except ClientError as e:
+                    code = e.response['Error']['Code']
+                    if code in THROTTLING_ERRORS and attempt < max_retries:
+                        _backoff(attempt)
+                        continue
+                    if code == ignored_error and not _single(permissions):
+                        failures += self._apply_permissions(
+                            method, group_id, _split_permissions(permissions),
+                            ignored_error, max_retries
+                        )
+                    elif code != ignored_error:
+                        print(f"✗ Erro em {method} no grupo {group_id}: {e}")
+                        failures += 1
+                    break
+        return failures
+
+    def _reconcile_group(self, group, desired, merge, dry_run, max_retries):
+        """Reconcilia as direções pedidas de um grupo já descrito."""
+        group_id = group['GroupId']
+        summary = {'authorized': 0, 'revoked': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+        for direction, specs in desired.items():
+            field, authorize, revoke, describe = DIRECTIONS[direction]
+            wanted = rules_from_spec(specs)
+            if merge:
+                wanted = merge_rules(wanted)
+            current = rules_from_permissions(group.get(field, []))
+            to_add = {rule: wanted[rule] for rule in wanted if rule not in current}
+            to_remove = {rule: None for rule in current if rule not in wanted}
+            to_describe = {rule: wanted[rule] for rule in wanted
+                           if rule in current and (current[rule] or None) != (wanted[rule] or None)}
+            summary['authorized'] += len(to_add)
+            summary['revoked'] += len(to_remove)
+            summary['updated'] += len(to_describe)
+            summary['unchanged'] += len(wanted) - len(to_add) - len(to_describe)
+            if dry_run:
+                continue
+            # Autoriza antes de revogar, para não haver janela sem acesso
+            # quando regras são substituídas por versões mescladas
+            summary['failed'] += self._apply_permissions(
+                authorize, group_id, to_permissions(to_add),
+                'InvalidPermission.Duplicate', max_retries
+            )
+            summary['failed'] += self._apply_permissions(
+                revoke, group_id, to_permissions(to_remove),
+                'InvalidPermission.NotFound', max_retries
+            )
+            # Regras sem descrição na política têm a descrição removida
+            summary['failed'] += self._apply_permissions(
+                describe, group_id, to_permissions(to_describe),
+                'InvalidPermission.NotFound', max_retries
+            )
+        return summary
+
+    def reconcile(self, group_id, ingress=None, egress=None, merge=True, dry_run=False,
+                  max_retries=8):
+        """
+        Deixa as regras de um grupo iguais às regras declaradas.
+        
+        Ver reconcile_many.
+        
+        Args:
+            group_id (str): ID do grupo
+            ingress (list): Regras de entrada desejadas (None = não alterar)
+            egress (list): Regras de saída desejadas (None = não alterar)
+            merge (bool): Mescla portas e CIDRs adjacentes antes de comparar
+            dry_run (bool): Só calcula a diferença, sem chamar a API
+            max_retries (int): Tentativas por chamada em caso de throttling
+            
+        Returns:
+            dict: Resumo com 'authorized', 'revoked', 'updated', 'unchanged'
+                e 'failed', {'error': mensagem} se a leitura do grupo falhou,
+                ou None se o grupo não foi encontrado
+        """
+        policy = {'ingress': ingress, 'egress': egress}
+        return self.reconcile_many({group_id: policy}, 1, merge, dry_run, max_retries)[group_id]
+
+    def reconcile_many(self, policies, max_workers=8, merge=True, dry_run=False, max_retries=8):
+        """
+        Reconcilia vários grupos com suas regras declaradas, em paralelo.
+        
+        Todos os grupos são lidos com describe_security_groups em lotes; se
+        a leitura de um lote falha, seus grupos não são alterados. A
+        diferença entre as regras desejadas e as atuais é calculada em
+        memória (uma regra por origem), e só o que falta é autorizado e só
+        o que sobra é revogado, com várias regras por chamada. Regras que
+        já existem, mas com outra descrição, só têm a descrição atualizada
+        ('updated'). Regras duplicadas na política não geram erro.
+        
+        Cada regra desejada é um dict como:
+            {'protocol': 'tcp', 'from_port': 443, 'to_port': 443,
+             'cidr_ip': ['10.0.0.0/24', '10.0.1.0/24'], 'description': 'HTTPS'}
+        com origens em 'cidr_ip', 'cidr_ipv6', 'source_group_id' ou
+        'prefix_list_id' (string ou lista). Em tcp/udp, from_port e to_port
+        são obrigatórios; especificações inválidas geram ValueError.
+        
+        Args:
+            policies (dict): ID do grupo -> {'ingress': [...], 'egress': [...]}
+                (direção ausente ou None = não alterar)
+            max_workers (int): Grupos reconciliados em paralelo
+            merge (bool): Mescla portas e CIDRs adjacentes antes de comparar
+            dry_run (bool): Só calcula a diferença, sem chamar a API
+            max_retries (int): Tentativas por chamada em caso de throttling
+            
+        Returns:
+            dict: ID do grupo -> resumo (como em reconcile), {'error': mensagem}
+                se a leitura do grupo falhou, ou None se o grupo não foi
+                encontrado
+        """
+        groups = {}
+        results = {}
+        group_ids = list(policies)
+        for start in range(0, len(group_ids), DESCRIBE_BATCH_SIZE):
+            chunk = group_ids[start:start + DESCRIBE_BATCH_SIZE]
+            try:
+                groups.update(self._describe_groups_by_id(chunk))
+            except ClientError as e:
+                print(f"✗ Erro ao ler {len(chunk)} Security Group(s) a partir de {chunk[0]}: {e}")
+                results.update((group_id, {'error': str(e)}) for group_id in chunk)
+        
+        jobs = {}
+        for group_id, policy in policies.items():
+            desired = {d: specs for d, specs in policy.items() if specs is not None}
+            if group_id in results:
+                continue
+            if group_id not in groups:
+                print(f"✗ Security Group não encontrado: {group_id}")
+                results[group_id] = None
+            else:
+                jobs[group_id] = desired
+        
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+                futures = {
+                    group_id: executor.submit(self._reconcile_group, groups[group_id],
+                                              desired, merge, dry_run, max_retries)
+                    for group_id, desired in jobs.items()
+                }
+                for group_id, future in futures.items():
+                    results[group_id] = future.result()
+                    summary = results[group_id]
+                    prefix = '(simulação) ' if dry_run else ''
+                    print(f"✓ {prefix}{group_id}: +{summary['authorized']} "
+                          f"-{summary['revoked']} ~{summary['updated']} "
+                          f"={summary['unchanged']} regra(s)")
+        return {group_id: results[group_id] for group_id in policies}
 
     def delete_security_group(self, group_id):
         """Deleta um Security Group."""
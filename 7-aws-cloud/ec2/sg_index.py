@@ -0,0 +1,338 @@
+"""
+Índice em memória das regras de Security Groups para consultas de alcance.
+
+Responde perguntas como "quais grupos permitem TCP 5432 a partir de
+10.2.3.4" sem percorrer todas as regras:
+
+- árvore de intervalos por (direção, protocolo) sobre as faixas de portas
+- trie de prefixos (bit a bit) por versão de IP sobre os CIDRs
+- índice reverso de grupos referenciados (UserIdGroupPairs) e prefix lists
+
+Uma consulta cruza o conjunto de regras que cobrem a porta com o conjunto
+de regras que cobrem a origem. O índice pode ser atualizado por grupo
+(update_groups), reindexando só os grupos cujas regras mudaram.
+"""
+
+import ipaddress
+from collections import defaultdict
+
+from sg_rules import ICMP_PROTOCOLS, normalize_protocol, rules_from_permissions
+
+DIRECTIONS = {'ingress': 'IpPermissions', 'egress': 'IpPermissionsEgress'}
+
+# Faixa que contém qualquer porta (ou tipo ICMP)
+ANY_PORT = (-1, 65535)
+
+
+def _port_interval(rule):
+    """
+    Faixa indexada de uma regra.
+
+    Para ICMP, indexa só o tipo (FromPort); -1 ou ausente vale qualquer
+    tipo. Nos demais protocolos, portas ausentes ou -1 valem qualquer porta.
+    """
+    if rule.from_port is None or rule.from_port == -1:
+        return ANY_PORT
+    if rule.protocol in ICMP_PROTOCOLS:
+        return rule.from_port, rule.from_port
+    return rule.from_port, rule.to_port
+
+
+class IntervalTree:
+    """Árvore de intervalos centrada e estática: (início, fim, valor), fechados."""
+
+    def __init__(self, intervals):
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        center = points[len(points) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        by_start = sorted(here, key=lambda i: i[0])
+        by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        return (center, by_start, by_end, self._build(left), self._build(right))
+
+    def stab(self, point):
+        """Retorna os valores dos intervalos que contêm point."""
+        found = []
+        node = self._root
+        while node is not None:
+            center, by_start, by_end, left, right = node
+            if point < center:
+                for start, _, value in by_start:
+                    if start > point:
+                        break
+                    found.append(value)
+                node = left
+            elif point > center:
+                for _, end, value in by_end:
+                    if end < point:
+                        break
+                    found.append(value)
+                node = right
+            else:
+                found.extend(value for _, _, value in by_start)
+                break
+        return found
+
+
+class PrefixTrie:
+    """Trie binária de prefixos IP; cada nó guarda os valores do seu prefixo."""
+
+    def __init__(self, bits):
+        self.bits = bits
+        # nó: [filho 0, filho 1, conjunto de valores]
+        self._root = [None, None, set()]
+
+    def _path(self, network, create):
+        node = self._root
+        address = int(network.network_address)
+        yield node
+        for i in range(network.prefixlen):
+            bit = (address >> (self.bits - 1 - i)) & 1
+            child = node[bit]
+            if child is None:
+                if not create:
+                    return
+                child = node[bit] = [None, None, set()]
+            node = child
+            yield node
+
+    def add(self, network, value):
+        for node in self._path(network, create=True):
+            pass
+        node[2].add(value)
+
+    def discard(self, network, value):
+        node = None
+        depth = -1
+        for depth, node in enumerate(self._path(network, create=False)):
+            pass
+        if node is not None and depth == network.prefixlen:
+            node[2].discard(value)
+
+    def covering(self, network):
+        """Retorna os valores de todos os prefixos que contêm network."""
+        found = set()
+        for node in self._path(network, create=False):
+            found.update(node[2])
+        return found
+
+
+class SecurityGroupIndex:
+    def __init__(self, groups=()):
+        """
+        Cria o índice a partir de grupos de describe_security_groups.
+
+        Args:
+            groups (iterable): Grupos como retornados pela API
+        """
+        # id da regra -> (GroupId, direção, Rule)
+        self.rules = {}
+        self._next_id = 0
+        self._group_rules = defaultdict(list)
+        self._fingerprints = {}
+        # (direção, protocolo) -> {id da regra: (início, fim)}; as árvores
+        # alteradas são reconstruídas ao fim de cada update_groups
+        self._port_ranges = defaultdict(dict)
+        self._trees = {}
+        self._dirty = set()
+        # direção -> ids das regras com protocolo -1 (todo o tráfego)
+        self._all_traffic = defaultdict(set)
+        # (direção, versão do IP) -> PrefixTrie
+        self._tries = {}
+        # (direção, GroupId ou PrefixListId referenciado) -> ids das regras
+        self._references = defaultdict(set)
+        self.update_groups(groups)
+
+    @staticmethod
+    def _fingerprint(group):
+        return repr((group.get('IpPermissions'), group.get('IpPermissionsEgress')))
+
+    def _trie(self, direction, network):
+        key = (direction, network.version)
+        trie = self._tries.get(key)
+        if trie is None:
+            trie = self._tries[key] = PrefixTrie(network.max_prefixlen)
+        return trie
+
+    def _add_rule(self, group_id, direction, rule):
+        rule_id = self._next_id
+        self._next_id += 1
+        self.rules[rule_id] = (group_id, direction, rule)
+        self._group_rules[group_id].append(rule_id)
+
+        if rule.protocol == '-1':
+            self._all_traffic[direction].add(rule_id)
+        else:
+            key = (direction, rule.protocol)
+            self._port_ranges[key][rule_id] = _port_interval(rule)
+            self._dirty.add(key)
+
+        if rule.kind in ('cidr', 'cidr6'):
+            network = ipaddress.ip_network(rule.source)
+            self._trie(direction, network).add(network, rule_id)
+        else:
+            self._references[(direction, rule.source)].add(rule_id)
+
+    def _remove_group(self, group_id):
+        for rule_id in self._group_rules.pop(group_id, []):
+            _, direction, rule = self.rules.pop(rule_id)
+            if rule.protocol == '-1':
+                self._all_traffic[direction].discard(rule_id)
+            else:
+                key = (direction, rule.protocol)
+                self._port_ranges[key].pop(rule_id, None)
+                self._dirty.add(key)
+            if rule.kind in ('cidr', 'cidr6'):
+                network = ipaddress.ip_network(rule.source)
+                self._trie(direction, network).discard(network, rule_id)
+            else:
+                self._references[(direction, rule.source)].discard(rule_id)
+        self._fingerprints.pop(group_id, None)
+
+    def update_groups(self, groups, complete=False):
+        """
+        Atualiza o índice com grupos recém-descritos.
+
+        Só os grupos cujas regras mudaram são reindexados.
+
+        Args:
+            groups (iterable): Grupos como retornados pela API
+            complete (bool): groups é a lista completa; grupos ausentes
+                são removidos do índice
+
+        Returns:
+            dict: Resumo com 'changed' e 'removed'
+        """
+        seen = set()
+        changed = 0
+        for group in groups:
+            group_id = group['GroupId']
+            seen.add(group_id)
+            fingerprint = self._fingerprint(group)
+            if self._fingerprints.get(group_id) == fingerprint:
+                continue
+            self._remove_group(group_id)
+            for direction, field in DIRECTIONS.items():
+                for rule in rules_from_permissions(group.get(field, [])):
+                    self._add_rule(group_id, direction, rule)
+            self._fingerprints[group_id] = fingerprint
+            changed += 1
+
+        removed = 0
+        if complete:
+            for group_id in [g for g in self._fingerprints if g not in seen]:
+                self._remove_group(group_id)
+                removed += 1
+
+        self._rebuild_trees()
+        return {'changed': changed, 'removed': removed}
+
+    def remove_groups(self, group_ids):
+        """
+        Remove grupos do índice (ex: grupos que deixaram de existir).
+
+        Args:
+            group_ids (iterable): IDs dos grupos
+
+        Returns:
+            int: Quantidade de grupos que estavam no índice
+        """
+        removed = 0
+        for group_id in group_ids:
+            if group_id in self._fingerprints:
+                self._remove_group(group_id)
+                removed += 1
+        self._rebuild_trees()
+        return removed
+
+    def _rebuild_trees(self):
+        for key in self._dirty:
+            self._trees[key] = IntervalTree(
+                (start, end, rule_id) for rule_id, (start, end) in self._port_ranges[key].items()
+            )
+        self._dirty.clear()
+
+    def _rules_for_port(self, direction, protocol, port):
+        key = (direction, protocol)
+        if port is None:
+            found = set(self._port_ranges.get(key, ()))
+        else:
+            tree = self._trees.get(key)
+            found = set(tree.stab(port)) if tree else set()
+        return found | self._all_traffic[direction]
+
+    def _rules_for_source(self, direction, source):
+        if source.startswith(('sg-', 'pl-')):
+            return set(self._references[(direction, source)])
+        network = ipaddress.ip_network(source, strict=False)
+        trie = self._tries.get((direction, network.version))
+        return trie.covering(network) if trie else set()
+
+    def matching_rules(self, protocol, port, source, direction='ingress'):
+        """
+        Regras que permitem o tráfego indicado.
+
+        Args:
+            protocol (str): Protocolo ('tcp', 'udp', 'icmp', '-1' ou número)
+            port (int): Porta, ou tipo ICMP para 'icmp'/'icmpv6' (o código
+                não é considerado); None = qualquer porta do protocolo
+            source (str): IP, CIDR (todo o bloco precisa estar coberto),
+                ID de grupo (sg-...) ou de prefix list (pl-...); na saída,
+                é o destino
+            direction (str): 'ingress' ou 'egress'
+
+        Returns:
+            list: Tuplas (GroupId, Rule)
+        """
+        protocol = normalize_protocol(protocol)
+        by_source = self._rules_for_source(direction, source)
+        if protocol == '-1':
+            # Só regras de todo o tráfego liberam todos os protocolos
+            matched = by_source & self._all_traffic[direction]
+        else:
+            matched = by_source & self._rules_for_port(direction, protocol, port)
+        return [(self.rules[rule_id][0], self.rules[rule_id][2]) for rule_id in sorted(matched)]
+
+    def allowed_groups(self, protocol, port, source, direction='ingress'):
+        """
+        Grupos que permitem o tráfego indicado (ver matching_rules).
+
+        Returns:
+            list: GroupIds, ordenados
+        """
+        return sorted({group_id for group_id, _ in
+                       self.matching_rules(protocol, port, source, direction)})
+
+    def referencing_groups(self, group_id, direction='ingress'):
+        """
+        Grupos com regras que referenciam um grupo (ou prefix list).
+
+        Args:
+            group_id (str): GroupId ou PrefixListId referenciado
+            direction (str): 'ingress' ou 'egress'
+
+        Returns:
+            list: GroupIds, ordenados
+        """
+        return sorted({self.rules[rule_id][0]
+                       for rule_id in self._references[(direction, group_id)]})
+
+    def stats(self):
+        """
+        Retorna o tamanho do índice.
+
+        Returns:
+            dict: Número de grupos e de regras indexados
+        """
+        return {'groups': len(self._fingerprints), 'rules': len(self.rules)}
@@ -0,0 +1,240 @@
+"""
+Modelo de regras de Security Group usado na reconciliação.
+
+Cada permissão da API (IpPermissions) é achatada em regras individuais,
+uma por origem, para que conjuntos de regras possam ser comparados,
+mesclados e convertidos de volta em IpPermissions agrupadas.
+"""
+
+import ipaddress
+from collections import namedtuple, defaultdict
+
+# Uma regra: protocolo, faixa de portas e uma única origem/destino.
+# kind: 'cidr', 'cidr6', 'group' ou 'prefix'
+Rule = namedtuple('Rule', ('protocol', 'from_port', 'to_port', 'kind', 'source'))
+
+# kind -> (lista em IpPermissions, campo do item)
+SOURCE_FIELDS = {
+    'cidr': ('IpRanges', 'CidrIp'),
+    'cidr6': ('Ipv6Ranges', 'CidrIpv6'),
+    'group': ('UserIdGroupPairs', 'GroupId'),
+    'prefix': ('PrefixListIds', 'PrefixListId'),
+}
+
+# Chave da especificação declarativa -> kind
+SPEC_SOURCES = {
+    'cidr_ip': 'cidr',
+    'cidr_ipv6': 'cidr6',
+    'source_group_id': 'group',
+    'prefix_list_id': 'prefix',
+}
+
+PROTOCOL_NAMES = {'6': 'tcp', '17': 'udp', '1': 'icmp', '58': 'icmpv6', 'all': '-1'}
+
+# Protocolos em que FromPort/ToPort são uma faixa de portas (mescláveis)
+PORT_RANGE_PROTOCOLS = ('tcp', 'udp')
+
+# Protocolos em que FromPort/ToPort são tipo/código ICMP, não portas
+ICMP_PROTOCOLS = ('icmp', 'icmpv6')
+
+# Tamanho máximo da descrição de uma regra na API
+MAX_DESCRIPTION_LENGTH = 255
+
+
+def normalize_protocol(protocol):
+    """Converte números e apelidos de protocolo no nome usado pela API."""
+    protocol = str(protocol).lower()
+    return PROTOCOL_NAMES.get(protocol, protocol)
+
+
+def _ports(protocol, from_port, to_port):
+    if protocol == '-1':
+        return None, None
+    return from_port, to_port
+
+
+def _spec_ports(spec, protocol):
+    from_port, to_port = _ports(protocol, spec.get('from_port'), spec.get('to_port'))
+    if protocol in ICMP_PROTOCOLS:
+        # Tipo/código ausente vale todos, como a API devolve (-1)
+        return (-1 if from_port is None else from_port), (-1 if to_port is None else to_port)
+    if protocol not in PORT_RANGE_PROTOCOLS:
+        return from_port, to_port
+    if not isinstance(from_port, int) or not isinstance(to_port, int):
+        raise ValueError(f"Regra {protocol} sem from_port/to_port inteiros: {spec}")
+    if not 0 <= from_port <= to_port <= 65535:
+        raise ValueError(f"Faixa de portas inválida: {spec}")
+    return from_port, to_port
+
+
+def _merge_descriptions(descriptions):
+    """Descrição de uma regra mesclada: as distintas, em ordem, unidas por '; '."""
+    unique = list(dict.fromkeys(d for d in descriptions if d))
+    return '; '.join(unique)[:MAX_DESCRIPTION_LENGTH] or None
+
+
+def _normalize_source(kind, source):
+    if kind in ('cidr', 'cidr6'):
+        return str(ipaddress.ip_network(source, strict=False))
+    return source
+
+
+def rules_from_permissions(ip_permissions):
+    """
+    Achata IpPermissions (como retornadas por describe_security_groups).
+
+    Args:
+        ip_permissions (list): IpPermissions ou IpPermissionsEgress
+
+    Returns:
+        dict: Rule -> descrição (ou None)
+    """
+    rules = {}
+    for permission in ip_permissions:
+        protocol = normalize_protocol(permission['IpProtocol'])
+        from_port, to_port = _ports(protocol, permission.get('FromPort'), permission.get('ToPort'))
+        for kind, (list_name, field) in SOURCE_FIELDS.items():
+            for entry in permission.get(list_name, []):
+                rule = Rule(protocol, from_port, to_port, kind, entry[field])
+                rules[rule] = entry.get('Description')
+    return rules
+
+
+def rules_from_spec(specs):
+    """
+    Converte regras declarativas em regras achatadas.
+
+    Cada especificação é um dict com 'protocol', 'from_port', 'to_port',
+    uma ou mais origens ('cidr_ip', 'cidr_ipv6', 'source_group_id',
+    'prefix_list_id'; cada uma pode ser uma string ou lista) e, opcionalmente,
+    'description'. Em tcp/udp, from_port e to_port são obrigatórios (ValueError
+    se ausentes ou fora de 0-65535); em ICMP, ausentes valem -1 (todos).
+
+    Args:
+        specs (list): Especificações de regras
+
+    Returns:
+        dict: Rule -> descrição (ou None)
+    """
+    rules = {}
+    for spec in specs:
+        protocol = normalize_protocol(spec['protocol'])
+        from_port, to_port = _spec_ports(spec, protocol)
+        sources = 0
+        for key, kind in SPEC_SOURCES.items():
+            values = spec.get(key)
+            if values is None:
+                continue
+            for value in [values] if isinstance(values, str) else values:
+                rule = Rule(protocol, from_port, to_port, kind, _normalize_source(kind, value))
+                rules[rule] = spec.get('description')
+                sources += 1
+        if not sources:
+            raise ValueError(f"Regra sem origem/destino: {spec}")
+    return rules
+
+
+def _merge_port_ranges(rules):
+    """Mescla faixas de portas sobrepostas ou adjacentes da mesma origem."""
+    groups = defaultdict(list)
+    merged = {}
+    for rule, description in rules.items():
+        if rule.protocol in PORT_RANGE_PROTOCOLS:
+            groups[(rule.protocol, rule.kind, rule.source)].append(
+                (rule.from_port, rule.to_port, description or '')
+            )
+        else:
+            merged[rule] = description
+
+    for (protocol, kind, source), ranges in groups.items():
+        ranges.sort()
+        start, end, description = ranges[0]
+        descriptions = [description]
+        for from_port, to_port, description in ranges[1:]:
+            if from_port <= end + 1:
+                end = max(end, to_port)
+                descriptions.append(description)
+            else:
+                merged[Rule(protocol, start, end, kind, source)] = _merge_descriptions(descriptions)
+                start, end, descriptions = from_port, to_port, [description]
+        merged[Rule(protocol, start, end, kind, source)] = _merge_descriptions(descriptions)
+    return merged
+
+
+def _collapse_cidrs(rules):
+    """Une CIDRs adjacentes ou contidos com o mesmo protocolo e portas."""
+    groups = defaultdict(list)
+    collapsed = {}
+    for rule, description in rules.items():
+        if rule.kind in ('cidr', 'cidr6'):
+            groups[rule[:4]].append((ipaddress.ip_network(rule.source), description))
+        else:
+            collapsed[rule] = description
+
+    for (protocol, from_port, to_port, kind), entries in groups.items():
+        entries.sort(key=lambda entry: entry[0])
+        for network in ipaddress.collapse_addresses(n for n, _ in entries):
+            rule = Rule(protocol, from_port, to_port, kind, str(network))
+            collapsed[rule] = _merge_descriptions(d for n, d in entries if n.subnet_of(network))
+    return collapsed
+
+
+def merge_rules(rules):
+    """
+    Reduz um conjunto de regras sem mudar o tráfego permitido.
+
+    Faixas de portas TCP/UDP sobrepostas ou adjacentes da mesma origem são
+    unidas e, em seguida, CIDRs adjacentes ou contidos com o mesmo
+    protocolo e portas viram um único bloco. Uma regra mesclada recebe as
+    descrições distintas das regras que a formaram, unidas por '; ' (até
+    255 caracteres).
+
+    Args:
+        rules (dict): Rule -> descrição
+
+    Returns:
+        dict: Regras mescladas -> descrição
+    """
+    return _collapse_cidrs(_merge_port_ranges(rules))
+
+
+def to_permissions(rules, max_sources=100):
+    """
+    Agrupa regras achatadas em IpPermissions para as chamadas da API.
+
+    Regras com o mesmo protocolo e portas compartilham uma permissão, e
+    as permissões são divididas em lotes de até max_sources origens.
+
+    Args:
+        rules (dict): Rule -> descrição
+        max_sources (int): Máximo de origens por chamada
+
+    Returns:
+        list: Lotes, cada um uma lista de IpPermissions
+    """
+    ordered = sorted(rules, key=lambda r: (r.protocol, r.from_port or 0, r.to_port or 0,
+                                           r.kind, r.source))
+    batches = []
+    permissions = {}
+    count = 0
+    for rule in ordered:
+        if count == max_sources:
+            batches.append(list(permissions.values()))
+            permissions = {}
+            count = 0
+        key = (rule.protocol, rule.from_port, rule.to_port)
+        permission = permissions.get(key)
+        if permission is None:
+            permission = permissions[key] = {'IpProtocol': rule.protocol}
+            if rule.from_port is not None:
+                permission['FromPort'] = rule.from_port
+                permission['ToPort'] = rule.to_port
+        list_name, field = SOURCE_FIELDS[rule.kind]
+        entry = {field: rule.source}
+        if rules[rule]:
+            entry['Description'] = rules[rule]
+        permission.setdefault(list_name, []).append(entry)
+        count += 1
+    if permissions:
+        batches.append(list(permissions.values()))
+    return batches
@@ -0,0 +1,72 @@
+"""
+Ponto de entrada leve para obter os gerenciadores AWS.
+
+Os módulos de cada gerenciador só são importados quando pedidos, e os
+clientes boto3 só são criados no primeiro uso (ver aws_clients.LazyClient),
+de modo que scripts curtos (ex: cron) não pagam pelo que não usam.
+
+Exemplo:
+    from managers import get_manager
+
+    dynamo = get_manager('dynamodb', region='us-east-1')
+"""
+
+import os
+import sys
+import importlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# nome -> (diretório, módulo, classe)
+MANAGERS = {
+    's3': ('s3', 'bucket_manager', 'S3BucketManager'),
+    's3-objects': ('s3', 'object_operations', 'S3ObjectOperations'),
+    'ec2': ('ec2', 'create_instances', 'EC2Manager'),
+    'elastic-ip-pool': ('ec2', 'elastic_ip_pool', 'ElasticIPPool'),
+    'security-groups': ('ec2', 'security_groups', 'SecurityGroupManager'),
+    'vpc': ('redes', 'vpc_manager', 'VPCManager'),
+    'load-balancer': ('redes', 'load_balancer', 'LoadBalancerManager'),
+    'dynamodb': ('banco-dados', 'dynamodb_manager', 'DynamoDBManager'),
+    'dynamodb-export': ('banco-dados', 'dynamodb_export', 'DynamoDBExporter'),
+    'rds': ('banco-dados', 'rds_manager', 'RDSManager'),
+    'cost-explorer': ('projeto-custos', 'cost_explorer', 'CostExplorer'),
+    'cleanup': ('projeto-custos', 'resource_cleanup', 'ResourceCleanup'),
+    'automation': ('projeto-custos', 'automation', 'CostAutomation'),
+    'reports': ('projeto-custos', 'reports', 'ReportGenerator'),
+}
+
+
+def get_manager_class(name):
+    """
+    Importa e retorna a classe de um gerenciador.
+
+    Args:
+        name (str): Nome do gerenciador (chave de MANAGERS)
+
+    Returns:
+        type: Classe do gerenciador
+    """
+    if name not in MANAGERS:
+        raise ValueError(f"Gerenciador desconhecido: {name} (opções: {', '.join(MANAGERS)})")
+
+    directory, module_name, class_name = MANAGERS[name]
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def get_manager(name, region='us-east-1', **kwargs):
+    """
+    Cria um gerenciador pelo nome.
+
+    Args:
+        name (str): Nome do gerenciador (chave de MANAGERS)
+        region (str): Região AWS
+        **kwargs: Argumentos extras do construtor
+
+    Returns:
+        Instância do gerenciador
+    """
+    return get_manager_class(name)(region=region, **kwargs)
@@ -0,0 +1,71 @@
+"""
+Utilitários de concorrência compartilhados pelos gerenciadores.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Marcador de fim de um produtor em iter_parallel
+_DONE = object()
+
+
+def iter_parallel(producers, max_workers, max_buffered):
+    """
+    Consome vários iteráveis em threads e gera seus itens conforme chegam.
+
+    A fila entre as threads e o consumidor é limitada (back-pressure): as
+    threads ficam bloqueadas enquanto o consumidor não acompanha. Se o
+    gerador for fechado antes do fim, as threads são avisadas e param.
+
+    Args:
+        producers (list): Funções sem argumentos que retornam iteráveis
+        max_workers (int): Número de threads
+        max_buffered (int): Máximo de itens aguardando o consumidor
+
+    Yields:
+        Itens dos produtores, sem ordem garantida entre eles
+    """
+    if not producers:
+        return
+
+    buffer = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(producer):
+        try:
+            if stop.is_set():
+                return
+            for item in producer():
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for producer in producers:
+            executor.submit(worker, producer)
+        remaining = len(producers)
+        while remaining:
+            item = buffer.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
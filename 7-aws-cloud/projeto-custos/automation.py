@@ -2,18 +2,24 @@
 Script para automação de economia de custos.
 """
 
-import boto3
+import os
+import sys
 import schedule
 import time
 from datetime import datetime
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class CostAutomation:
+    ec2_client = LazyClient('ec2')
+    cloudwatch = LazyClient('cloudwatch')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o automador de custos."""
-        self.ec2_client = boto3.client('ec2', region_name=region)
-        self.cloudwatch = boto3.client('cloudwatch', region_name=region)
+        self.region = region
 
     def stop_idle_instances(self, cpu_threshold=5, duration_hours=2):
         """
@@ -2,16 +2,22 @@
 Script para analisar e otimizar custos na AWS.
 """
 
-import boto3
+import os
+import sys
 from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class CostExplorer:
+    ce_client = LazyClient('ce')
+    ec2_client = LazyClient('ec2')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o analisador de custos."""
-        self.ce_client = boto3.client('ce', region_name=region)
-        self.ec2_client = boto3.client('ec2', region_name=region)
+        self.region = region
 
     def get_daily_costs(self, days=30):
         """
@@ -2,16 +2,22 @@
 Script para limpeza automática de recursos subutilizados.
 """
 
-import boto3
+import os
+import sys
 from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class ResourceCleanup:
+    ec2_client = LazyClient('ec2')
+    s3_client = LazyClient('s3')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador de limpeza de recursos."""
-        self.ec2_client = boto3.client('ec2', region_name=region)
-        self.s3_client = boto3.client('s3', region_name=region)
+        self.region = region
 
     def find_and_delete_unused_volumes(self, days=30, dry_run=True):
         """
@@ -2,14 +2,20 @@
 Script para gerenciar Load Balancers na AWS.
 """
 
-import boto3
+import os
+import sys
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class LoadBalancerManager:
+    elb_client = LazyClient('elbv2')
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador de Load Balancers."""
-        self.elb_client = boto3.client('elbv2', region_name=region)
+        self.region = region
 
     def create_alb(self, name, subnets, security_groups=None, scheme='internet-facing'):
         """
@@ -2,15 +2,21 @@
 Script para gerenciar VPC e subnets na AWS.
 """
 
-import boto3
+import os
+import sys
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
 
 class VPCManager:
+    ec2_client = LazyClient('ec2')
+    ec2_resource = LazyClient('ec2', resource=True)
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador VPC."""
-        self.ec2_client = boto3.client('ec2', region_name=region)
-        self.ec2_resource = boto3.resource('ec2', region_name=region)
+        self.region = region
 
     def create_vpc(self, cidr_block, tag_name=None):
         """
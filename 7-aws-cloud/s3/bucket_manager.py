@@ -2,16 +2,33 @@
 Script para gerenciar buckets S3 na AWS.
 """
 
-import boto3
+import os
+import sys
 import json
 from botocore.exceptions import ClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+from parallel import iter_parallel
+
+
+def _object_record(obj):
+    """Converte um item de 'Contents' no registro usado pelo gerenciador."""
+    return {
+        'Key': obj['Key'],
+        'Size': obj['Size'],
+        'LastModified': str(obj['LastModified']),
+        'StorageClass': obj.get('StorageClass', 'STANDARD')
+    }
+
 
 class S3BucketManager:
+    s3_client = LazyClient('s3')
+    s3_resource = LazyClient('s3', resource=True)
+
     def __init__(self, region='us-east-1'):
         """Inicializa o gerenciador S3."""
-        self.s3_client = boto3.client('s3', region_name=region)
-        self.s3_resource = boto3.resource('s3', region_name=region)
+        self.region = region
 
     def create_bucket(self, bucket_name):
         """
@@ -100,6 +117,9 @@ class S3BucketManager:
         """
         Lista objetos em um bucket.
         
+        Percorre todas as páginas; para buckets grandes prefira
+        iter_objects, que não mantém a listagem inteira em memória.
+        
         Args:
             bucket_name (str): Nome do bucket
             prefix (str): Prefixo para filtrar
@@ -107,27 +127,112 @@ class S3BucketManager:
         Returns:
             list: Lista de objetos
         """
-        try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=bucket_name,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                return []
-            
-            objects = [{
-                'Key': obj['Key'],
-                'Size': obj['Size'],
-                'LastModified': str(obj['LastModified']),
-                'StorageClass': obj['StorageClass']
-            } for obj in response['Contents']]
+        return list(self.iter_objects(bucket_name, prefix))
+
+    def iter_objects(self, bucket_name, prefix='', start_after=None,
+                     continuation_token=None, page_size=1000):
+        """
+        Gera os objetos de um bucket página a página, sob demanda.
+        
+        Para retomar uma listagem interrompida, passe a última chave
+        processada em start_after (ou um NextContinuationToken salvo).
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            prefix (str): Prefixo para filtrar
+            start_after (str): Lista apenas chaves posteriores a esta
+            continuation_token (str): Token de continuação de uma listagem anterior
+            page_size (int): Número de chaves por requisição (máx. 1000)
             
-            return objects
+        Yields:
+            dict: Registro do objeto (Key, Size, LastModified, StorageClass)
+        """
+        try:
+            yield from self._paginate_objects(bucket_name, prefix, start_after,
+                                              continuation_token, page_size)
         except ClientError as e:
             print(f"✗ Erro ao listar objetos: {e}")
+
+    def _paginate_objects(self, bucket_name, prefix='', start_after=None,
+                          continuation_token=None, page_size=1000):
+        """Como iter_objects, mas propaga ClientError."""
+        params = {'Bucket': bucket_name, 'Prefix': prefix}
+        if start_after:
+            params['StartAfter'] = start_after
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+        
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            **params, PaginationConfig={'PageSize': page_size}
+        )
+        for page in pages:
+            for obj in page.get('Contents', []):
+                yield _object_record(obj)
+
+    def list_prefixes(self, bucket_name, prefix='', delimiter='/'):
+        """
+        Lista os prefixos imediatamente abaixo de um prefixo.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            prefix (str): Prefixo base
+            delimiter (str): Delimitador de "diretórios"
+            
+        Returns:
+            list: Prefixos comuns (CommonPrefixes)
+        """
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            prefixes = []
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix,
+                                           Delimiter=delimiter):
+                prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            return prefixes
+        except ClientError as e:
+            print(f"✗ Erro ao listar prefixos: {e}")
             return []
 
+    def iter_objects_parallel(self, bucket_name, prefixes=None, prefix='',
+                              delimiter='/', max_workers=8, max_buffered=10000):
+        """
+        Lista prefixos disjuntos em paralelo, gerando os objetos conforme chegam.
+        
+        Sem prefixes explícitos, o prefixo base é expandido pelo delimitador
+        (um nível) e cada subprefixo é listado em uma thread. A fila entre as
+        threads e o consumidor é limitada, mantendo a memória constante. A
+        ordem dos objetos entre prefixos diferentes não é garantida. Um erro
+        na listagem de qualquer prefixo é propagado ao consumidor
+        (ClientError), em vez de truncar o inventário em silêncio.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            prefixes (list): Prefixos disjuntos a listar (opcional)
+            prefix (str): Prefixo base expandido quando prefixes não é informado
+            delimiter (str): Delimitador usado na expansão
+            max_workers (int): Número de prefixos listados simultaneamente
+            max_buffered (int): Máximo de registros aguardando o consumidor
+            
+        Yields:
+            dict: Registro do objeto (Key, Size, LastModified, StorageClass)
+        """
+        if prefixes is None:
+            # Uma única listagem com delimitador: objetos diretamente no
+            # prefixo base saem já; os subprefixos são distribuídos às threads
+            prefixes = []
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix,
+                                           Delimiter=delimiter):
+                prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+                for obj in page.get('Contents', []):
+                    yield _object_record(obj)
+        
+        producers = [
+            lambda sub_prefix=sub_prefix: self._paginate_objects(bucket_name, sub_prefix)
+            for sub_prefix in prefixes
+        ]
+        yield from iter_parallel(producers, max_workers, max_buffered)
+
     def get_object_metadata(self, bucket_name, object_key):
         """
         Obtém metadados de um objeto.
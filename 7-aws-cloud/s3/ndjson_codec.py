@@ -0,0 +1,151 @@
+"""
+Codificação e decodificação incremental de JSON Lines (NDJSON) para S3.
+
+Usa orjson quando instalado (serialização mais rápida) e suporta
+compressão gzip e, se o pacote zstandard estiver disponível, zstd.
+"""
+
+import io
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Content-Encoding gravado no objeto para cada compressão suportada
+CONTENT_ENCODINGS = {'gzip': 'gzip', 'zstd': 'zstd'}
+
+
+def dumps_line(record):
+    """
+    Serializa um registro como uma linha NDJSON compacta.
+
+    Args:
+        record: Objeto serializável em JSON
+
+    Returns:
+        bytes: Linha codificada em UTF-8, terminada em '\\n'
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def loads_line(line):
+    """
+    Deserializa uma linha NDJSON.
+
+    Args:
+        line (bytes): Linha sem o '\\n' final
+
+    Returns:
+        Objeto deserializado
+    """
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _compressor(compression):
+    """Retorna um compressor incremental (compress/flush) ou None."""
+    if compression is None:
+        return None
+    if compression == 'gzip':
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Compressão zstd requer o pacote 'zstandard'")
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Compressão não suportada: {compression}")
+
+
+def _decompressor(compression):
+    """Retorna um descompressor incremental ou None."""
+    if compression is None:
+        return None
+    if compression == 'gzip':
+        return zlib.decompressobj(47)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Compressão zstd requer o pacote 'zstandard'")
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Compressão não suportada: {compression}")
+
+
+class NDJSONReader(io.RawIOBase):
+    """
+    Arquivo somente-leitura que produz NDJSON (opcionalmente comprimido)
+    a partir de um iterável de registros, sob demanda.
+
+    Permite enviar os registros com upload_fileobj sem materializar o
+    conteúdo inteiro em memória.
+    """
+
+    def __init__(self, records, compression=None):
+        self._records = iter(records)
+        self._compressor = _compressor(compression)
+        self._buffer = bytearray()
+        self._finished = False
+        self.records_written = 0
+
+    def readable(self):
+        return True
+
+    def _fill(self, size):
+        while len(self._buffer) < size and not self._finished:
+            try:
+                line = dumps_line(next(self._records))
+                self.records_written += 1
+                if self._compressor is not None:
+                    line = self._compressor.compress(line)
+                self._buffer += line
+            except StopIteration:
+                self._finished = True
+                if self._compressor is not None:
+                    self._buffer += self._compressor.flush()
+
+    def readinto(self, b):
+        self._fill(len(b))
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
+def iter_records(chunks, compression=None):
+    """
+    Decodifica registros NDJSON a partir de blocos de bytes.
+
+    Args:
+        chunks (iterable): Blocos de bytes (possivelmente comprimidos)
+        compression (str): None, 'gzip' ou 'zstd'
+
+    Yields:
+        Registros deserializados, um por linha não vazia
+    """
+    decompressor = _decompressor(compression)
+    pending = b''
+
+    def split(data):
+        nonlocal pending
+        lines = (pending + data).split(b'\n')
+        pending = lines.pop()
+        return [loads_line(line) for line in lines if line.strip()]
+
+    for chunk in chunks:
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        if chunk:
+            yield from split(chunk)
+    if decompressor is not None and hasattr(decompressor, 'flush'):
+        yield from split(decompressor.flush())
+    if pending.strip():
+        yield loads_line(pending)
@@ -0,0 +1,233 @@
+"""
+Cache local (memória + disco) para leituras de objetos S3.
+
+As entradas são indexadas por bucket/chave e guardam o ETag do objeto,
+usado para revalidar com GET condicional (If-None-Match). Com ttl, leituras
+dentro do prazo são servidas sem nenhuma requisição.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+MB = 1024 * 1024
+
+# Contadores de leitura atualizados por record()
+COUNTERS = ('hits', 'revalidations', 'misses')
+
+
+class ObjectCache:
+    def __init__(self, max_memory_bytes=64 * MB, cache_dir=None,
+                 max_disk_bytes=1024 * MB, ttl=None):
+        """
+        Inicializa o cache de objetos.
+
+        Args:
+            max_memory_bytes (int): Limite de bytes mantidos em memória (LRU)
+            cache_dir (str): Diretório do cache em disco (opcional)
+            max_disk_bytes (int): Limite de bytes mantidos em disco (LRU)
+            ttl (float): Segundos em que uma entrada é usada sem revalidar;
+                None revalida sempre pelo ETag
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self):
+        """Reconstrói o índice LRU do disco a partir dos arquivos existentes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.data'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_bytes += size
+
+    @staticmethod
+    def _name(bucket_name, object_key):
+        return hashlib.sha256(f"{bucket_name}/{object_key}".encode('utf-8')).hexdigest()
+
+    def _path(self, name, suffix):
+        return os.path.join(self.cache_dir, name + suffix)
+
+    def is_fresh(self, entry):
+        """Indica se a entrada pode ser usada sem revalidação (modo TTL)."""
+        return self.ttl is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    def get(self, bucket_name, object_key):
+        """
+        Obtém uma entrada do cache.
+
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+
+        Returns:
+            dict: {'etag', 'data', 'fetched_at'} ou None
+        """
+        name = self._name(bucket_name, object_key)
+        with self._lock:
+            entry = self._memory.get(name)
+            if entry is not None:
+                self._memory.move_to_end(name)
+                return entry
+            if name not in self._disk:
+                return None
+            self._disk.move_to_end(name)
+
+        try:
+            with open(self._path(name, '.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._path(name, '.data'), 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError):
+            self._drop_disk(name)
+            return None
+
+        entry = {'etag': meta['etag'], 'data': data, 'fetched_at': meta['fetched_at']}
+        with self._lock:
+            self._store_memory(name, entry)
+        return entry
+
+    def put(self, bucket_name, object_key, etag, data):
+        """
+        Grava (ou substitui) uma entrada no cache.
+
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            etag (str): ETag do objeto
+            data (bytes): Conteúdo do objeto
+        """
+        name = self._name(bucket_name, object_key)
+        entry = {'etag': etag, 'data': data, 'fetched_at': time.time()}
+        with self._lock:
+            self._store_memory(name, entry)
+        if self.cache_dir and len(data) <= self.max_disk_bytes:
+            self._store_disk(name, entry)
+
+    def record(self, event):
+        """
+        Conta o resultado de uma leitura, sob o lock do cache.
+
+        Args:
+            event (str): 'hits', 'revalidations' ou 'misses'
+        """
+        if event not in COUNTERS:
+            raise ValueError(f"Contador desconhecido: {event}")
+        with self._lock:
+            setattr(self, event, getattr(self, event) + 1)
+
+    def touch(self, bucket_name, object_key, entry):
+        """Marca uma entrada como revalidada agora (resposta 304)."""
+        name = self._name(bucket_name, object_key)
+        with self._lock:
+            entry['fetched_at'] = time.time()
+            if name in self._memory:
+                self._memory.move_to_end(name)
+            on_disk = name in self._disk
+            if on_disk:
+                self._disk.move_to_end(name)
+        if self.cache_dir and on_disk:
+            try:
+                self._write_meta(name, entry)
+            except OSError:
+                self._drop_disk(name)
+
+    def invalidate(self, bucket_name, object_key):
+        """Remove uma entrada do cache (memória e disco)."""
+        name = self._name(bucket_name, object_key)
+        with self._lock:
+            entry = self._memory.pop(name, None)
+            if entry is not None:
+                self._memory_bytes -= len(entry['data'])
+        self._drop_disk(name)
+
+    def stats(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Acertos, revalidações, faltas e bytes ocupados
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._disk_bytes
+            }
+
+    def _store_memory(self, name, entry):
+        size = len(entry['data'])
+        old = self._memory.pop(name, None)
+        if old is not None:
+            self._memory_bytes -= len(old['data'])
+        if size > self.max_memory_bytes:
+            return
+        self._memory[name] = entry
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted['data'])
+
+    def _write_meta(self, name, entry):
+        tmp = self._path(name, '.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'etag': entry['etag'], 'fetched_at': entry['fetched_at']}, f)
+        os.replace(tmp, self._path(name, '.json'))
+
+    def _store_disk(self, name, entry):
+        try:
+            tmp = self._path(name, '.data.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(entry['data'])
+            os.replace(tmp, self._path(name, '.data'))
+            self._write_meta(name, entry)
+        except OSError:
+            self._drop_disk(name)
+            return
+
+        evict = []
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(name, 0)
+            self._disk[name] = len(entry['data'])
+            self._disk_bytes += len(entry['data'])
+            while self._disk_bytes > self.max_disk_bytes:
+                evicted, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evict.append(evicted)
+        for evicted in evict:
+            self._remove_files(evicted)
+
+    def _drop_disk(self, name):
+        if not self.cache_dir:
+            return
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(name, 0)
+        self._remove_files(name)
+
+    def _remove_files(self, name):
+        for suffix in ('.data', '.json'):
+            try:
+                os.remove(self._path(name, suffix))
+            except FileNotFoundError:
+                pass
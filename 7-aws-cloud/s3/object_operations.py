@@ -2,15 +2,96 @@
 Script para operações com objetos S3.
 """
 
-import boto3
+import os
+import sys
+import mmap
+import time
+import codecs
+import random
+import threading
 import json
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from botocore.exceptions import ClientError
+from ndjson_codec import CONTENT_ENCODINGS, NDJSONReader, iter_records
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aws_clients import LazyClient
+
+MB = 1024 * 1024
+
+# Tamanho padrão dos blocos em leituras por streaming e por faixas
+STREAM_CHUNK_SIZE = 1 * MB
+RANGE_PART_SIZE = 8 * MB
+
+# Limite de chaves por chamada de delete_objects
+DELETE_BATCH_SIZE = 1000
+
+# Códigos de erro por chave que indicam throttling e podem ser repetidos
+RETRYABLE_DELETE_ERRORS = {'SlowDown', 'InternalError', 'ServiceUnavailable'}
+
+# Configuração padrão de transferência compartilhada por todos os uploads
+# (o TransferConfig é criado no primeiro uso para não importar o boto3 antes)
+DEFAULT_TRANSFER_OPTIONS = {
+    'multipart_threshold': 16 * MB,
+    'multipart_chunksize': 16 * MB,
+    'max_concurrency': 4,
+    'use_threads': True
+}
+
+
+class _ByteBudget:
+    """
+    Orçamento global de bytes em trânsito, compartilhado entre as threads.
+
+    Um arquivo maior que o orçamento inteiro ainda pode ser enviado, mas
+    somente quando nenhum outro estiver em andamento.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size):
+        size = min(size, self.max_bytes)
+        with self._cond:
+            while self._in_use and self._in_use + size > self.max_bytes:
+                self._cond.wait()
+            self._in_use += size
+        return size
+
+    def release(self, size):
+        with self._cond:
+            self._in_use -= size
+            self._cond.notify_all()
 
 
 class S3ObjectOperations:
-    def __init__(self, region='us-east-1'):
-        """Inicializa o gerenciador de objetos S3."""
-        self.s3_client = boto3.client('s3', region_name=region)
+    s3_client = LazyClient('s3')
+
+    def __init__(self, region='us-east-1', transfer_config=None, cache=None):
+        """
+        Inicializa o gerenciador de objetos S3.
+
+        Args:
+            region (str): Região AWS
+            transfer_config (TransferConfig): Configuração de transferência
+                (tamanho das partes, concorrência e limite para multipart)
+            cache (ObjectCache): Cache de leitura para get_object_content e
+                get_json_object (opcional)
+        """
+        self.region = region
+        self._transfer_config = transfer_config
+        self.cache = cache
+
+    @property
+    def transfer_config(self):
+        """TransferConfig usado em uploads e cópias gerenciadas."""
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+            self._transfer_config = TransferConfig(**DEFAULT_TRANSFER_OPTIONS)
+        return self._transfer_config
 
     def put_object_with_content(self, bucket_name, object_key, content, 
                                content_type='text/plain'):
@@ -30,11 +111,13 @@ class S3ObjectOperations:
                 Body=content,
                 ContentType=content_type
             )
+            if self.cache:
+                self.cache.invalidate(bucket_name, object_key)
             print(f"✓ Objeto criado: s3://{bucket_name}/{object_key}")
         except ClientError as e:
             print(f"✗ Erro ao criar objeto: {e}")
 
-    def put_json_object(self, bucket_name, object_key, data):
+    def put_json_object(self, bucket_name, object_key, data, compact=False):
         """
         Cria um objeto JSON no S3.
         
@@ -42,15 +125,21 @@ class S3ObjectOperations:
             bucket_name (str): Nome do bucket
             object_key (str): Chave do objeto
             data (dict): Dados para serializar
+            compact (bool): Usa separadores compactos em vez de indentação
         """
         try:
-            json_content = json.dumps(data, indent=2)
+            if compact:
+                json_content = json.dumps(data, separators=(',', ':'))
+            else:
+                json_content = json.dumps(data, indent=2)
             self.s3_client.put_object(
                 Bucket=bucket_name,
                 Key=object_key,
                 Body=json_content,
                 ContentType='application/json'
             )
+            if self.cache:
+                self.cache.invalidate(bucket_name, object_key)
             print(f"✓ Objeto JSON criado: s3://{bucket_name}/{object_key}")
         except ClientError as e:
             print(f"✗ Erro ao criar objeto JSON: {e}")
@@ -59,6 +148,9 @@ class S3ObjectOperations:
         """
         Obtém o conteúdo de um objeto.
         
+        Com cache configurado, uma cópia local válida é revalidada pelo
+        ETag (If-None-Match) ou, no modo TTL, usada sem requisição.
+        
         Args:
             bucket_name (str): Nome do bucket
             object_key (str): Chave do objeto
@@ -67,6 +159,8 @@ class S3ObjectOperations:
             str: Conteúdo do objeto
         """
         try:
+            if self.cache:
+                return self._get_cached_bytes(bucket_name, object_key).decode('utf-8')
             response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
             content = response['Body'].read().decode('utf-8')
             return content
@@ -74,6 +168,33 @@ class S3ObjectOperations:
             print(f"✗ Erro ao obter objeto: {e}")
             return None
 
+    def _get_cached_bytes(self, bucket_name, object_key):
+        """Lê um objeto passando pelo cache (read-through)."""
+        cache = self.cache
+        entry = cache.get(bucket_name, object_key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.record('hits')
+            return entry['data']
+        
+        params = {'Bucket': bucket_name, 'Key': object_key}
+        if entry is not None:
+            params['IfNoneMatch'] = entry['etag']
+        try:
+            response = self.s3_client.get_object(**params)
+        except ClientError as e:
+            status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            if entry is not None and (status == 304 or e.response['Error']['Code'] == '304'):
+                cache.record('revalidations')
+                cache.touch(bucket_name, object_key, entry)
+                return entry['data']
+            cache.invalidate(bucket_name, object_key)
+            raise
+        
+        cache.record('misses')
+        data = response['Body'].read()
+        cache.put(bucket_name, object_key, response['ETag'], data)
+        return data
+
     def get_json_object(self, bucket_name, object_key):
         """
         Obtém e deserializa um objeto JSON.
@@ -94,26 +215,377 @@ class S3ObjectOperations:
             print(f"✗ Erro ao deserializar JSON: {e}")
             return None
 
+    def put_ndjson_records(self, bucket_name, object_key, records, compression=None):
+        """
+        Grava registros como JSON Lines (NDJSON) por streaming.
+        
+        Os registros são serializados e comprimidos sob demanda enquanto o
+        upload (multipart, conforme o TransferConfig) consome o fluxo, sem
+        materializar o objeto inteiro em memória.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            records (iterable): Registros serializáveis em JSON
+            compression (str): None, 'gzip' ou 'zstd'
+            
+        Returns:
+            int: Número de registros gravados, ou None em caso de erro
+        """
+        extra_args = {'ContentType': 'application/x-ndjson'}
+        if compression:
+            extra_args['ContentEncoding'] = CONTENT_ENCODINGS[compression]
+        
+        try:
+            reader = NDJSONReader(records, compression)
+            self.s3_client.upload_fileobj(
+                reader, bucket_name, object_key,
+                ExtraArgs=extra_args, Config=self.transfer_config
+            )
+            print(f"✓ {reader.records_written} registro(s) gravado(s): s3://{bucket_name}/{object_key}")
+            return reader.records_written
+        except ClientError as e:
+            print(f"✗ Erro ao gravar NDJSON: {e}")
+            return None
+
+    def iter_ndjson_records(self, bucket_name, object_key, compression=None,
+                            chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Lê registros JSON Lines (NDJSON) por streaming.
+        
+        Sem compression explícito, usa o Content-Encoding do objeto.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            compression (str): None, 'gzip' ou 'zstd'
+            chunk_size (int): Tamanho dos blocos lidos do S3
+            
+        Yields:
+            Registros deserializados, um por linha
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
+        except ClientError as e:
+            print(f"✗ Erro ao ler NDJSON: {e}")
+            return
+        
+        if compression is None:
+            encoding = response.get('ContentEncoding')
+            if encoding in CONTENT_ENCODINGS.values():
+                compression = encoding
+        
+        yield from iter_records(response['Body'].iter_chunks(chunk_size), compression)
+
+    def iter_object_chunks(self, bucket_name, object_key, chunk_size=STREAM_CHUNK_SIZE,
+                           start=None, end=None, as_memoryview=False):
+        """
+        Lê um objeto por streaming, em blocos, sem carregá-lo inteiro.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            chunk_size (int): Tamanho de cada bloco em bytes
+            start (int): Primeiro byte da faixa (Range HTTP, opcional)
+            end (int): Último byte da faixa, inclusivo (opcional)
+            as_memoryview (bool): Gera memoryviews em vez de bytes
+            
+        Yields:
+            bytes | memoryview: Blocos do conteúdo
+        """
+        params = {'Bucket': bucket_name, 'Key': object_key}
+        if start is not None or end is not None:
+            params['Range'] = f"bytes={start or 0}-{'' if end is None else end}"
+        
+        try:
+            response = self.s3_client.get_object(**params)
+            for chunk in response['Body'].iter_chunks(chunk_size):
+                yield memoryview(chunk) if as_memoryview else chunk
+        except ClientError as e:
+            print(f"✗ Erro ao ler objeto: {e}")
+
+    def iter_object_text(self, bucket_name, object_key, encoding='utf-8',
+                         chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Lê um objeto de texto por streaming, decodificando incrementalmente.
+        
+        Caracteres multibyte divididos entre blocos são tratados pelo
+        decodificador incremental.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            encoding (str): Codificação do texto
+            chunk_size (int): Tamanho de cada bloco em bytes
+            
+        Yields:
+            str: Trechos do texto decodificado
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        for chunk in self.iter_object_chunks(bucket_name, object_key, chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def _read_range_into(self, bucket_name, object_key, view, offset, etag):
+        """
+        Baixa a faixa [offset, offset + len(view)) diretamente em view.
+
+        Com If-Match, a faixa só é lida se o objeto ainda tiver o ETag do
+        HEAD; se foi sobrescrito no meio do download, o S3 responde 412
+        (PreconditionFailed) em vez de misturar duas versões no buffer.
+        """
+        response = self.s3_client.get_object(
+            Bucket=bucket_name,
+            Key=object_key,
+            Range=f"bytes={offset}-{offset + len(view) - 1}",
+            IfMatch=etag
+        )
+        position = 0
+        for chunk in response['Body'].iter_chunks(STREAM_CHUNK_SIZE):
+            view[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        return position
+
+    def _fill_ranges(self, bucket_name, object_key, view, part_size, max_workers, etag):
+        """Preenche view com GETs por faixa (da versão etag) executados em paralelo."""
+        offsets = range(0, len(view), part_size)
+        parts = [view[offset:offset + part_size] for offset in offsets]
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._read_range_into, bucket_name, object_key,
+                                    part, offset, etag)
+                    for part, offset in zip(parts, offsets)
+                ]
+                return sum(future.result() for future in futures)
+        finally:
+            # Um erro guarda as faixas no traceback; sem liberá-las, o mmap
+            # de download_to_mmap não pode ser fechado
+            for part in parts:
+                part.release()
+
+    def download_ranges(self, bucket_name, object_key, buffer=None,
+                        part_size=RANGE_PART_SIZE, max_workers=8):
+        """
+        Baixa um objeto com GETs por faixa em paralelo para um buffer pré-alocado.
+        
+        Cada faixa é escrita diretamente na sua posição do buffer, sem
+        concatenações intermediárias. Todas as faixas são pedidas com o ETag
+        do HEAD (If-Match): se o objeto for sobrescrito durante o download,
+        a operação falha em vez de retornar um conteúdo misturado.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            buffer (bytearray): Buffer de destino com pelo menos o tamanho
+                do objeto (opcional; alocado se não informado)
+            part_size (int): Tamanho de cada faixa em bytes
+            max_workers (int): Número de faixas baixadas simultaneamente
+            
+        Returns:
+            memoryview: Visão do buffer com o conteúdo do objeto
+        """
+        try:
+            head = self.s3_client.head_object(Bucket=bucket_name, Key=object_key)
+            size = head['ContentLength']
+            if buffer is None:
+                buffer = bytearray(size)
+            elif len(buffer) < size:
+                raise ValueError(f"Buffer menor que o objeto ({len(buffer)} < {size} bytes)")
+            
+            view = memoryview(buffer)[:size]
+            self._fill_ranges(bucket_name, object_key, view, part_size, max_workers,
+                              head['ETag'])
+            return view
+        except ClientError as e:
+            print(f"✗ Erro ao baixar objeto por faixas: {e}")
+            return None
+
+    def download_to_mmap(self, bucket_name, object_key, file_path,
+                         part_size=RANGE_PART_SIZE, max_workers=8):
+        """
+        Baixa um objeto com GETs por faixa em paralelo para um arquivo mapeado.
+        
+        O arquivo é criado com o tamanho do objeto e mapeado em memória;
+        as páginas são gravadas pelo sistema operacional, sem manter o
+        objeto inteiro no heap do processo. Como em download_ranges, as
+        faixas exigem o ETag do HEAD (If-Match). O download é feito em
+        file_path + '.tmp' e só substitui file_path quando termina; em
+        erro, o temporário é removido e file_path não é alterado.
+        
+        Args:
+            bucket_name (str): Nome do bucket
+            object_key (str): Chave do objeto
+            file_path (str): Caminho local do arquivo
+            part_size (int): Tamanho de cada faixa em bytes
+            max_workers (int): Número de faixas baixadas simultaneamente
+            
+        Returns:
+            bool: True se o download foi concluído
+        """
+        tmp = file_path + '.tmp'
+        try:
+            head = self.s3_client.head_object(Bucket=bucket_name, Key=object_key)
+            size = head['ContentLength']
+            with open(tmp, 'wb+') as f:
+                f.truncate(size)
+                if size:
+                    with mmap.mmap(f.fileno(), size) as mapped:
+                        view = memoryview(mapped)
+                        try:
+                            self._fill_ranges(bucket_name, object_key, view,
+                                              part_size, max_workers, head['ETag'])
+                        finally:
+                            view.release()
+                        mapped.flush()
+            os.replace(tmp, file_path)
+            print(f"✓ Objeto baixado: {file_path}")
+            return True
+        except ClientError as e:
+            print(f"✗ Erro ao baixar objeto por faixas: {e}")
+            return False
+        finally:
+            # Depois do os.replace o temporário já não existe
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+
     def copy_object(self, source_bucket, source_key, dest_bucket, dest_key):
         """
         Copia um objeto entre buckets ou dentro do mesmo bucket.
         
+        Usa a cópia gerenciada do boto3: acima do multipart_threshold do
+        TransferConfig, a cópia é feita em partes (UploadPartCopy) em
+        paralelo, o que também permite copiar objetos maiores que 5 GB.
+        
         Args:
             source_bucket (str): Bucket de origem
             source_key (str): Chave de origem
             dest_bucket (str): Bucket de destino
             dest_key (str): Chave de destino
+            
+        Returns:
+            bool: True se copiado com sucesso
         """
         try:
             copy_source = {'Bucket': source_bucket, 'Key': source_key}
-            self.s3_client.copy_object(
-                CopySource=copy_source,
-                Bucket=dest_bucket,
-                Key=dest_key
+            self.s3_client.copy(
+                copy_source, dest_bucket, dest_key, Config=self.transfer_config
             )
+            if self.cache:
+                self.cache.invalidate(dest_bucket, dest_key)
             print(f"✓ Objeto copiado para: s3://{dest_bucket}/{dest_key}")
+            return True
         except ClientError as e:
             print(f"✗ Erro ao copiar objeto: {e}")
+            return False
+
+    def _iter_prefix(self, bucket_name, prefix):
+        """Gera (chave relativa ao prefixo, objeto) para cada objeto do prefixo."""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'][len(prefix):], obj
+
+    @staticmethod
+    def _needs_copy(source, dest):
+        """Decide se o objeto de origem difere do destino."""
+        if dest is None or source['Size'] != dest['Size']:
+            return True
+        # ETags de uploads multipart ("...-N") dependem do tamanho das partes
+        # e não são comparáveis; nesse caso vale a data de modificação
+        if '-' not in source['ETag'] and '-' not in dest['ETag']:
+            return source['ETag'] != dest['ETag']
+        return source['LastModified'] > dest['LastModified']
+
+    def _copy_one(self, source_bucket, source_key, dest_bucket, dest_key):
+        """Copia um objeto e retorna a mensagem de erro, se houver."""
+        try:
+            self.s3_client.copy(
+                {'Bucket': source_bucket, 'Key': source_key},
+                dest_bucket, dest_key, Config=self.transfer_config
+            )
+            if self.cache:
+                self.cache.invalidate(dest_bucket, dest_key)
+            return None
+        except Exception as e:
+            return str(e)
+
+    def sync_prefix(self, source_bucket, source_prefix, dest_bucket, dest_prefix,
+                    max_workers=8, dry_run=False):
+        """
+        Sincroniza um prefixo de origem com um prefixo de destino.
+        
+        O destino é listado uma vez; a origem é percorrida página a página
+        e só os objetos ausentes ou diferentes (ETag, tamanho ou data) são
+        copiados, no servidor e em paralelo.
+        
+        Args:
+            source_bucket (str): Bucket de origem
+            source_prefix (str): Prefixo de origem
+            dest_bucket (str): Bucket de destino
+            dest_prefix (str): Prefixo de destino
+            max_workers (int): Número de objetos copiados simultaneamente
+            dry_run (bool): Se True, apenas calcula a diferença
+            
+        Returns:
+            dict: Resumo com 'total', 'copied', 'skipped', 'failed', 'bytes'
+                e a lista 'errors' ({'Key', 'Error'})
+        """
+        summary = {'total': 0, 'copied': 0, 'skipped': 0, 'failed': 0,
+                   'bytes': 0, 'errors': []}
+        try:
+            dest_objects = {
+                relative: {'Size': obj['Size'], 'ETag': obj['ETag'],
+                           'LastModified': obj['LastModified']}
+                for relative, obj in self._iter_prefix(dest_bucket, dest_prefix)
+            }
+            
+            # Limita as cópias pendentes para não acumular a origem inteira
+            pending = threading.BoundedSemaphore(max_workers * 4)
+            lock = threading.Lock()
+            
+            def done(future, source_key, size):
+                error = future.result()
+                with lock:
+                    if error:
+                        summary['failed'] += 1
+                        summary['errors'].append({'Key': source_key, 'Error': error})
+                    else:
+                        summary['copied'] += 1
+                        summary['bytes'] += size
+                pending.release()
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for relative, obj in self._iter_prefix(source_bucket, source_prefix):
+                    summary['total'] += 1
+                    if not self._needs_copy(obj, dest_objects.get(relative)):
+                        summary['skipped'] += 1
+                        continue
+                    if dry_run:
+                        summary['copied'] += 1
+                        summary['bytes'] += obj['Size']
+                        continue
+                    
+                    pending.acquire()
+                    future = executor.submit(self._copy_one, source_bucket, obj['Key'],
+                                             dest_bucket, dest_prefix + relative)
+                    future.add_done_callback(
+                        lambda f, key=obj['Key'], size=obj['Size']: done(f, key, size)
+                    )
+        except ClientError as e:
+            print(f"✗ Erro ao sincronizar prefixos: {e}")
+            summary['error'] = str(e)
+            return summary
+        
+        print(f"✓ Sincronização: {summary['copied']} copiado(s), "
+              f"{summary['skipped']} inalterado(s), {summary['failed']} falha(s)")
+        return summary
 
     def generate_presigned_url(self, bucket_name, object_key, expiration=3600):
         """
@@ -138,48 +610,167 @@ class S3ObjectOperations:
             print(f"✗ Erro ao gerar URL pré-assinada: {e}")
             return None
 
-    def batch_upload(self, bucket_name, file_list):
+    def _upload_one(self, bucket_name, local_path, s3_key, budget):
+        """Envia um único arquivo respeitando o orçamento de bytes."""
+        result = {
+            'local_path': local_path,
+            's3_key': s3_key,
+            'size': 0,
+            'success': False,
+            'error': None
+        }
+        try:
+            result['size'] = os.path.getsize(local_path)
+        except OSError as e:
+            result['error'] = str(e)
+            return result
+
+        # Memória usada pelo s3transfer: no máximo uma parte por thread
+        config = self.transfer_config
+        reserved = budget.acquire(
+            min(result['size'], config.multipart_chunksize * config.max_concurrency)
+        )
+        try:
+            self.s3_client.upload_file(local_path, bucket_name, s3_key, Config=config)
+            result['success'] = True
+        except Exception as e:
+            result['error'] = str(e)
+        finally:
+            budget.release(reserved)
+        return result
+
+    def batch_upload(self, bucket_name, file_list, max_workers=8,
+                     max_inflight_bytes=512 * MB):
         """
-        Faz upload em lote de múltiplos arquivos.
-        
+        Faz upload em lote de múltiplos arquivos em paralelo.
+
+        Cada arquivo usa o TransferConfig da instância (multipart acima do
+        limite configurado); o total de bytes em trânsito é limitado por
+        max_inflight_bytes. file_list é consumido aos poucos: no máximo
+        max_workers * 4 arquivos ficam aguardando envio.
+
         Args:
             bucket_name (str): Nome do bucket
-            file_list (list): Lista de tuplas (local_path, s3_key)
+            file_list (iterable): Tuplas (local_path, s3_key)
+            max_workers (int): Número de arquivos enviados simultaneamente
+            max_inflight_bytes (int): Limite global de bytes em trânsito
+
+        Returns:
+            dict: Resumo com 'total', 'success', 'failed', 'bytes' e a
+                lista 'results' com o resultado de cada arquivo
         """
-        try:
-            success = 0
-            fail = 0
-            
+        budget = _ByteBudget(max_inflight_bytes)
+        results = []
+
+        def collect(finished):
+            for future in finished:
+                result = future.result()
+                if not result['success']:
+                    print(f"✗ Erro ao enviar {result['local_path']}: {result['error']}")
+                results.append(result)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Janela de envios pendentes: file_list não é materializado inteiro
+            futures = set()
             for local_path, s3_key in file_list:
-                try:
-                    self.s3_client.upload_file(local_path, bucket_name, s3_key)
-                    print(f"✓ {local_path} → s3://{bucket_name}/{s3_key}")
-                    success += 1
-                except Exception as e:
-                    print(f"✗ Erro ao enviar {local_path}: {e}")
-                    fail += 1
-            
-            print(f"\n✓ Resumo: {success} sucesso(s), {fail} falha(s)")
-        except ClientError as e:
-            print(f"✗ Erro no upload em lote: {e}")
+                if len(futures) >= max_workers * 4:
+                    finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                futures.add(executor.submit(self._upload_one, bucket_name, local_path, s3_key,
+                                            budget))
+            collect(wait(futures).done)
+
+        success = sum(1 for r in results if r['success'])
+        return {
+            'total': len(results),
+            'success': success,
+            'failed': len(results) - success,
+            'bytes': sum(r['size'] for r in results if r['success']),
+            'results': results
+        }
+
+    def _delete_chunk(self, bucket_name, keys, max_retries):
+        """Deleta um bloco de até 1000 chaves, repetindo as que sofreram throttling."""
+        pending = keys
+        errors = []
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in pending], 'Quiet': True}
+                )
+                failed = response.get('Errors', [])
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                failed = [{'Key': key, 'Code': code, 'Message': str(e)} for key in pending]
 
-    def batch_delete(self, bucket_name, keys_list):
+            retry = [err for err in failed if err.get('Code') in RETRYABLE_DELETE_ERRORS]
+            errors.extend(err for err in failed if err.get('Code') not in RETRYABLE_DELETE_ERRORS)
+            if not retry:
+                break
+            if attempt == max_retries:
+                errors.extend(retry)
+                break
+
+            pending = [err['Key'] for err in retry]
+            time.sleep(random.uniform(0, min(20, 0.5 * 2 ** attempt)))
+
+        return len(keys) - len(errors), errors
+
+    def batch_delete(self, bucket_name, keys_list, max_workers=8, max_retries=5):
         """
-        Deleta múltiplos objetos.
-        
+        Deleta múltiplos objetos em blocos de 1000 chaves enviados em paralelo.
+
+        Chaves que falham por throttling são reenviadas com backoff
+        exponencial; as demais falhas são reportadas no resumo. keys_list é
+        consumido aos poucos: no máximo max_workers * 2 blocos ficam em
+        memória ao mesmo tempo.
+
         Args:
             bucket_name (str): Nome do bucket
-            keys_list (list): Lista de chaves para deletar
+            keys_list (iterable): Chaves para deletar
+            max_workers (int): Número de blocos enviados simultaneamente
+            max_retries (int): Tentativas extras para chaves com throttling
+
+        Returns:
+            dict: Resumo com 'total', 'deleted', 'failed' e a lista 'errors'
+                ({'Key', 'Code', 'Message'}) das chaves não deletadas
         """
-        try:
-            delete_objects = [{'Key': key} for key in keys_list]
-            self.s3_client.delete_objects(
-                Bucket=bucket_name,
-                Delete={'Objects': delete_objects}
-            )
-            print(f"✓ {len(keys_list)} objeto(s) deletado(s)")
-        except ClientError as e:
-            print(f"✗ Erro ao deletar objetos: {e}")
+        keys = iter(keys_list)
+        total = 0
+        deleted = 0
+        errors = []
+
+        def collect(finished):
+            nonlocal deleted
+            for future in finished:
+                chunk_deleted, chunk_errors = future.result()
+                deleted += chunk_deleted
+                errors.extend(chunk_errors)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Janela de blocos em andamento: só lê mais chaves quando um termina
+            futures = set()
+            while True:
+                if len(futures) >= max_workers * 2:
+                    finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                chunk = list(islice(keys, DELETE_BATCH_SIZE))
+                if not chunk:
+                    break
+                total += len(chunk)
+                futures.add(executor.submit(self._delete_chunk, bucket_name, chunk, max_retries))
+            collect(wait(futures).done)
+
+        if errors:
+            print(f"✗ {len(errors)} objeto(s) não deletado(s)")
+        print(f"✓ {deleted} objeto(s) deletado(s)")
+        return {
+            'total': total,
+            'deleted': deleted,
+            'failed': len(errors),
+            'errors': errors
+        }
 
 
 # Exemplo de uso